@@ -0,0 +1,154 @@
+import itertools
+from functools import cached_property
+
+import numpy as np
+
+import Estimation
+
+
+class SignalAnalysis:
+    """
+    Lazily computed and cached analysis of one clean signal (time step, spectra, frequency estimate and power).
+    A new instance is created whenever a signal is loaded, so cached values never go stale.
+    Each instance gets a unique signal_id that other caches can key their entries on.
+    """
+    _ids = itertools.count()
+
+    def __init__(self, time, amplitude):
+        self.signal_id = next(SignalAnalysis._ids)
+        self.time = time
+        self.amplitude = amplitude
+
+    @cached_property
+    def time_step(self):
+        return float(np.mean(np.diff(self.time)))
+
+    @cached_property
+    def sampling_rate(self):
+        return 1 / self.time_step
+
+    @cached_property
+    def rfft(self):
+        return np.fft.rfft(self.amplitude)
+
+    @cached_property
+    def rfft_frequencies(self):
+        return np.fft.rfftfreq(len(self.amplitude), d=self.time_step)
+
+    @cached_property
+    def spectrum_frequencies(self):
+        """Frequencies of magnitude_spectrum, in increasing order (zero frequency in the middle)."""
+        return np.fft.fftshift(np.fft.fftfreq(len(self.amplitude), d=self.time_step))
+
+    @cached_property
+    def magnitude_spectrum(self):
+        """
+        Two-sided magnitude spectrum normalized by the signal length, as drawn in the frequency plot.
+        Ordered like spectrum_frequencies, so it can be clipped and decimated to the visible range.
+        Built from the real FFT (|X[-k]| = |X[k]|) without materializing the full complex spectrum.
+        """
+        n = len(self.amplitude)
+        magnitude = np.abs(self.rfft)
+        magnitude /= n
+        return np.concatenate([magnitude[n // 2:0:-1], magnitude[:n - n // 2]])
+
+    def sampled_spectrum(self, sampling_frequency, frequency_range):
+        """
+        Magnitude spectrum of the signal sampled at sampling_frequency, limited to frequency_range.
+        Sampling repeats the spectrum every fs, so the baseband spectrum is first folded once into
+        [-fs/2, fs/2) and the visible range is then filled by tiling that folded image.
+        Returns a dict with the visible 'frequencies' and their 'magnitude', the 'folded_frequencies'
+        and 'folded_magnitude' of the central image, and the 'aliases' of dominant components above
+        fs/2 as an array of (original frequency, alias frequency, magnitude) rows.
+        """
+        frequencies = self.spectrum_frequencies
+        magnitude = self.magnitude_spectrum
+        bin_width = self.rfft_frequencies[1] if len(self.rfft_frequencies) > 1 else 1.0
+        half_rate = sampling_frequency / 2
+
+        # Fold every bin into [-fs/2, fs/2) and accumulate the images that land on the same folded bin
+        folded_bins = max(1, int(np.ceil(sampling_frequency / bin_width)))
+        folded_index = np.floor(np.mod(frequencies + half_rate, sampling_frequency) / bin_width).astype(int)
+        folded_magnitude = np.bincount(np.minimum(folded_index, folded_bins - 1), weights=magnitude,
+                                       minlength=folded_bins)
+        folded_frequencies = -half_rate + bin_width * np.arange(folded_bins)
+
+        # Tile the folded image over the visible range only
+        low, high = frequency_range
+        visible = frequencies[np.searchsorted(frequencies, low):np.searchsorted(frequencies, high, side='right')]
+        visible_index = np.floor(np.mod(visible + half_rate, sampling_frequency) / bin_width).astype(int)
+        visible_magnitude = folded_magnitude[np.minimum(visible_index, folded_bins - 1)]
+
+        # Dominant components above fs/2 show up at their alias frequency inside the central image
+        estimated = self.frequency_estimate["frequencies"]
+        peaks = np.concatenate([estimated, -estimated])
+        peaks = peaks[np.abs(peaks) >= half_rate]
+        alias_frequencies = np.mod(peaks + half_rate, sampling_frequency) - half_rate
+        aliases = np.column_stack([peaks, alias_frequencies, np.interp(peaks, frequencies, magnitude)])
+
+        return {
+            "frequencies": visible,
+            "magnitude": visible_magnitude,
+            "folded_frequencies": folded_frequencies,
+            "folded_magnitude": folded_magnitude,
+            "aliases": aliases,
+        }
+
+    @cached_property
+    def power(self):
+        return float(np.mean(self.amplitude ** 2))
+
+    @cached_property
+    def frequency_estimate(self):
+        """
+        Sub-bin estimate of the dominant frequencies, the highest one and its confidence, reusing the cached
+        rfft (see Estimation.estimate_frequencies).
+        """
+        return Estimation.estimate_frequencies(self.amplitude, self.time_step, self.rfft)
+
+    @property
+    def max_frequency(self):
+        """Highest dominant frequency from frequency_estimate, or None if the signal has no clear peak."""
+        return self.frequency_estimate["max_frequency"]
+
+
+class MultiChannelSignal:
+    """
+    Channels that share one time axis, held as an (N, channels) amplitude array, with a lazily built
+    SignalAnalysis per channel. Sampling and reconstruction work on all channels at once, so their
+    results are cached under the signal_id of the whole set.
+    """
+
+    def __init__(self, time, amplitude, names=None):
+        self.signal_id = next(SignalAnalysis._ids)
+        self.time = time
+        self.amplitude = amplitude
+        self.names = list(names) if names is not None else [f"Channel {index + 1}"
+                                                            for index in range(amplitude.shape[1])]
+        self._channels = {}
+
+    @property
+    def channel_count(self):
+        return self.amplitude.shape[1]
+
+    @cached_property
+    def time_step(self):
+        return float(np.mean(np.diff(self.time)))
+
+    def channel(self, index):
+        """The cached SignalAnalysis of one channel, on a contiguous copy of its amplitudes."""
+        if index not in self._channels:
+            self._channels[index] = SignalAnalysis(self.time, np.ascontiguousarray(self.amplitude[:, index]))
+        return self._channels[index]
+
+    @cached_property
+    def frequency_estimate(self):
+        """Frequency estimate of the channel with the highest dominant frequency, which sets the Nyquist rate."""
+        estimates = [self.channel(index).frequency_estimate for index in range(self.channel_count)]
+        return max(estimates, key=lambda estimate: -np.inf if estimate["max_frequency"] is None
+                   else estimate["max_frequency"])
+
+    @property
+    def max_frequency(self):
+        """Highest dominant frequency over all channels, or None if no channel has a clear peak."""
+        return self.frequency_estimate["max_frequency"]
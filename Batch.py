@@ -0,0 +1,140 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import Analysis
+import Precision
+import Reconstruction
+import Sampling
+import SignalIO
+
+
+def collect_signal_files(paths):
+    """Expands the given files and directories (searched recursively for CSV files) into a sorted file list."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True))
+        else:
+            files.append(path)
+    return sorted(set(files))
+
+
+def process_signal_file(file_name, methods, sampling_frequency=None, sampling_mode=Sampling.DEFAULT_SAMPLING_MODE,
+                        compact=False):
+    """
+    Runs the load -> sample -> reconstruct -> error pipeline on one file without any GUI.
+    When sampling_frequency is None the minimum valid rate round(2 * f_max) + 1 is used,
+    matching the "Valid Freq Sampling" button of the main window.
+    With compact=True the amplitudes are processed as float32 and every method also reports its
+    float64 MSE and the largest float32/float64 difference.
+    """
+    summary = {"file": file_name}
+    try:
+        start = time.perf_counter()
+        signal_time, amplitude = SignalIO.load_signal_file(file_name)
+        amplitude = Precision.as_working(amplitude, compact)
+        summary["load_seconds"] = time.perf_counter() - start
+        summary["samples"] = len(amplitude)
+
+        start = time.perf_counter()
+        analysis = Analysis.SignalAnalysis(signal_time, amplitude)
+        max_frequency = analysis.max_frequency
+        summary["analysis_seconds"] = time.perf_counter() - start
+        if max_frequency is None:
+            raise ValueError("No dominant frequency found in the signal.")
+        summary["max_frequency"] = max_frequency
+        summary["max_frequency_confidence"] = analysis.frequency_estimate["confidence"]
+
+        if sampling_frequency is None:
+            sampling_frequency = round(2 * max_frequency) + 1
+        summary["sampling_frequency"] = sampling_frequency
+        summary["sampling_mode"] = sampling_mode
+        if sampling_mode == "Stride":
+            summary["sampling_interval"] = Sampling.sampling_interval(signal_time, sampling_frequency,
+                                                                      analysis.time_step)
+        t_sampled, amplitude_sampled = Sampling.sample_signal(signal_time, amplitude, sampling_frequency,
+                                                              analysis.time_step, sampling_mode)
+        if len(t_sampled) > 1:
+            summary["effective_sampling_frequency"] = float((len(t_sampled) - 1) / (t_sampled[-1] - t_sampled[0]))
+
+        # Every method in one pass over the intermediate data they share
+        signals, seconds = Reconstruction.reconstruct_all(t_sampled, amplitude_sampled, signal_time, methods)
+        summary["shared_seconds"] = seconds["Shared"]
+        summary["methods"] = {
+            method: dict(Reconstruction.reconstruction_metrics(amplitude, reconstructed_signal),
+                         seconds=seconds[method])
+            for method, reconstructed_signal in signals.items()
+        }
+        if "Non-uniform Sinc (Iterative)" in signals and len(t_sampled) > 1:
+            bandwidth = Reconstruction.nonuniform_bandwidth(t_sampled)
+            summary["methods"]["Non-uniform Sinc (Iterative)"]["bandwidth"] = bandwidth
+            if bandwidth < max_frequency:
+                summary["warning"] = (f"Non-uniform reconstruction band-limited to {bandwidth:.1f} Hz, "
+                                      f"below the maximum frequency {max_frequency:.1f} Hz.")
+        if compact:
+            impact = Precision.precision_impact(signals, t_sampled, amplitude_sampled, signal_time, amplitude)
+            for method, report in impact.items():
+                summary["methods"][method].update(report)
+    except (IOError, ValueError) as error:
+        summary["error"] = str(error)
+    return summary
+
+
+def run_batch(files, methods, sampling_frequency=None, workers=None, sampling_mode=Sampling.DEFAULT_SAMPLING_MODE,
+              compact=False):
+    """Processes every file on a pool of worker processes and returns the summaries in input order."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(process_signal_file, file_name, methods, sampling_frequency, sampling_mode,
+                                   compact)
+                   for file_name in files]
+        return [future.result() for future in futures]
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Sample and reconstruct signal files headlessly and summarize the reconstruction error.")
+    parser.add_argument("paths", nargs="+", help="Signal CSV files or directories containing them.")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Path of the JSON summary to write ('-' for standard output).")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (defaults to the number of CPUs).")
+    parser.add_argument("--fs", type=float, default=None,
+                        help="Sampling frequency in Hz (defaults to the minimum valid rate 2 * f_max + 1).")
+    parser.add_argument("--sampling-mode", default=Sampling.DEFAULT_SAMPLING_MODE, choices=Sampling.SAMPLING_MODES,
+                        help="How the samples are taken from the signal (exact rate or integer stride).")
+    parser.add_argument("--compact", action="store_true",
+                        help="Process amplitudes as float32 and report the precision impact per method.")
+    parser.add_argument("--methods", nargs="+", default=list(Reconstruction.RECONSTRUCTION_METHODS),
+                        choices=list(Reconstruction.RECONSTRUCTION_METHODS), metavar="METHOD",
+                        help="Reconstruction methods to evaluate (defaults to all registered methods).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    files = collect_signal_files(arguments.paths)
+    if not files:
+        print("No signal files found.", file=sys.stderr)
+        return 1
+
+    summaries = run_batch(files, arguments.methods, arguments.fs, arguments.workers, arguments.sampling_mode,
+                          arguments.compact)
+    if arguments.output == "-":
+        json.dump(summaries, sys.stdout, indent=2, allow_nan=False)
+        sys.stdout.write("\n")
+    else:
+        with open(arguments.output, "w") as output_file:
+            json.dump(summaries, output_file, indent=2, allow_nan=False)
+
+    failures = sum("error" in summary for summary in summaries)
+    print(f"Processed {len(summaries)} file(s), {failures} failed.", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import Analysis
+import Batch
+import Reconstruction
+import Sampling
+import SignalIO
+
+# Signal lengths of the synthetic cases; the signal always spans one second, so longer means finer resolution.
+DEFAULT_LENGTHS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+# Sampling frequencies as multiples of the Nyquist rate 2 * f_max: aliased, critical and oversampled.
+DEFAULT_NYQUIST_RATIOS = [0.5, 1.0, 2.0]
+
+# Components (Hz, amplitude) of the synthetic test signal.
+SYNTHETIC_COMPONENTS = [(5, 1.0), (20, 0.5)]
+
+# A run is flagged as a regression when it is slower or uses more memory than the baseline by this fraction.
+DEFAULT_TOLERANCE = 0.25
+
+# Timings below this many seconds are too noisy to compare against a baseline.
+MIN_COMPARED_SECONDS = 1e-3
+
+ANALYSIS_STAGE = "Frequency Estimate"
+
+
+def synthetic_signal(length):
+    """One second of the synthetic test signal with the given number of points."""
+    signal_time = np.linspace(0, 1, length, endpoint=False)
+    amplitude = np.zeros(length)
+    for frequency, scale in SYNTHETIC_COMPONENTS:
+        amplitude += scale * np.sin(2 * np.pi * frequency * signal_time)
+    return signal_time, amplitude
+
+
+def measure(function, repeats):
+    """
+    Runs function once under tracemalloc to get its peak memory, then `repeats` times without it.
+    Returns (result, best wall time in seconds, peak traced memory in bytes).
+    """
+    tracemalloc.start()
+    result = function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return result, best, peak_bytes
+
+
+def benchmark_case(case, signal_time, amplitude, max_frequency, ratios, methods, repeats,
+                   sampling_mode=Sampling.DEFAULT_SAMPLING_MODE):
+    """Benchmarks the analysis path, the sampling and every method at each sampling ratio for one signal."""
+    records = []
+    analysis = Analysis.SignalAnalysis(signal_time, amplitude)
+
+    # A fresh analysis object per run, so the cached spectrum is not reused between repeats
+    estimated, seconds, peak_bytes = measure(lambda: Analysis.SignalAnalysis(signal_time, amplitude).max_frequency,
+                                             repeats)
+    records.append({
+        "case": case, "samples": len(amplitude), "ratio": None, "method": ANALYSIS_STAGE,
+        "seconds": seconds, "peak_bytes": peak_bytes,
+        "error": abs(estimated - max_frequency) if estimated is not None else None,
+    })
+
+    for ratio in ratios:
+        sampling_frequency = ratio * 2 * max_frequency
+        (t_sampled, amplitude_sampled), seconds, peak_bytes = measure(
+            lambda: Sampling.sample_signal(signal_time, amplitude, sampling_frequency, analysis.time_step,
+                                           sampling_mode), repeats)
+        records.append({
+            "case": case, "samples": len(amplitude), "ratio": ratio, "method": f"Sampling ({sampling_mode})",
+            "sampling_frequency": sampling_frequency, "sampled_points": len(t_sampled),
+            "seconds": seconds, "peak_bytes": peak_bytes, "error": None,
+        })
+        for method in methods:
+            reconstructed_signal, seconds, peak_bytes = measure(
+                lambda: Reconstruction.reconstruct(method, t_sampled, amplitude_sampled, signal_time), repeats)
+            difference = amplitude - reconstructed_signal
+            records.append({
+                "case": case, "samples": len(amplitude), "ratio": ratio, "method": method,
+                "sampling_frequency": sampling_frequency, "sampled_points": len(t_sampled),
+                "seconds": seconds, "peak_bytes": peak_bytes,
+                "error": float(np.mean(difference ** 2)),
+                "max_error": float(np.max(np.abs(difference))),
+            })
+            print(f"{case:>28} {ratio:>5} x Nyquist {method:>22}: {seconds * 1e3:10.2f} ms "
+                  f"{peak_bytes / 2 ** 20:9.1f} MB  MSE {records[-1]['error']:.3e}", file=sys.stderr)
+    return records
+
+
+def run_benchmarks(lengths, ratios, methods, data_paths, repeats=3, sampling_mode=Sampling.DEFAULT_SAMPLING_MODE):
+    """Runs the synthetic cases for every length and the bundled signal files, and returns the records."""
+    records = []
+    max_frequency = max(frequency for frequency, _ in SYNTHETIC_COMPONENTS)
+    for length in lengths:
+        signal_time, amplitude = synthetic_signal(length)
+        records.extend(benchmark_case(f"synthetic-{length}", signal_time, amplitude, max_frequency, ratios, methods,
+                                      repeats, sampling_mode))
+
+    for file_name in Batch.collect_signal_files(data_paths) if data_paths else []:
+        signal_time, amplitude = SignalIO.load_signal_file(file_name)
+        max_frequency = Analysis.SignalAnalysis(signal_time, amplitude).max_frequency
+        if max_frequency is None:
+            print(f"Skipping {file_name}: no dominant frequency found.", file=sys.stderr)
+            continue
+        records.extend(benchmark_case(os.path.basename(file_name), signal_time, amplitude, max_frequency, ratios,
+                                      methods, repeats, sampling_mode))
+    return records
+
+
+def _record_key(record):
+    return record["case"], record["ratio"], record["method"]
+
+
+def find_regressions(records, baseline_records, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares records against a baseline run and describes every case that became slower, used more
+    memory or got less accurate by more than tolerance.
+    """
+    baseline = {_record_key(record): record for record in baseline_records}
+    regressions = []
+    for record in records:
+        previous = baseline.get(_record_key(record))
+        if previous is None:
+            continue
+        name = "{} / {} / {}".format(*_record_key(record))
+        if (max(record["seconds"], previous["seconds"]) >= MIN_COMPARED_SECONDS
+                and record["seconds"] > previous["seconds"] * (1 + tolerance)):
+            regressions.append(f"{name}: time {previous['seconds']:.4g}s -> {record['seconds']:.4g}s")
+        if record["peak_bytes"] > previous["peak_bytes"] * (1 + tolerance) + 2 ** 16:
+            regressions.append(f"{name}: peak memory {previous['peak_bytes']} -> {record['peak_bytes']} bytes")
+        if (record["error"] is not None and previous["error"] is not None
+                and record["error"] > previous["error"] * (1 + tolerance) + 1e-12):
+            regressions.append(f"{name}: error {previous['error']:.4g} -> {record['error']:.4g}")
+    return regressions
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the reconstruction methods and the frequency analysis over signal lengths, "
+                    "sampling ratios and the bundled signals.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json",
+                        help="Path of the JSON results file to write.")
+    parser.add_argument("--baseline", default=None,
+                        help="Results file of an earlier run to compare against; regressions make the exit code 1.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative slowdown, memory growth or error growth reported as a regression.")
+    parser.add_argument("--lengths", nargs="+", type=int, default=DEFAULT_LENGTHS,
+                        help="Lengths of the synthetic signals.")
+    parser.add_argument("--ratios", nargs="+", type=float, default=DEFAULT_NYQUIST_RATIOS,
+                        help="Sampling frequencies as multiples of the Nyquist rate.")
+    parser.add_argument("--data", nargs="*", default=["Data"],
+                        help="Signal files or directories to benchmark in addition to the synthetic signals.")
+    parser.add_argument("--methods", nargs="+", default=list(Reconstruction.RECONSTRUCTION_METHODS),
+                        choices=list(Reconstruction.RECONSTRUCTION_METHODS), metavar="METHOD",
+                        help="Reconstruction methods to benchmark (defaults to all registered methods).")
+    parser.add_argument("--sampling-mode", default=Sampling.DEFAULT_SAMPLING_MODE, choices=Sampling.SAMPLING_MODES,
+                        help="How the samples are taken from the signal (exact rate or integer stride).")
+    parser.add_argument("-r", "--repeats", type=int, default=3,
+                        help="Timed runs per case; the fastest one is recorded.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    arguments = parse_arguments(argv)
+    records = run_benchmarks(arguments.lengths, arguments.ratios, arguments.methods, arguments.data,
+                             arguments.repeats, arguments.sampling_mode)
+    results = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "records": records,
+    }
+    with open(arguments.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Wrote {len(records)} benchmark records to {arguments.output}.", file=sys.stderr)
+
+    if arguments.baseline is None:
+        return 0
+    with open(arguments.baseline) as baseline_file:
+        baseline_records = json.load(baseline_file)["records"]
+    regressions = find_regressions(records, baseline_records, arguments.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    print(f"{len(regressions)} regression(s) against {arguments.baseline}.", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ReconstructionCache:
+    """
+    Thread-safe least-recently-used cache of reconstructions keyed by (signal id, method, sampling stride).
+    Values are dicts of NumPy arrays; the least recently used entries are evicted once their total
+    size exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def entry_size(value):
+        return sum(array.nbytes for array in value.values() if isinstance(array, np.ndarray))
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, value):
+        size = self.entry_size(value)
+        if size > self.max_bytes:
+            return  # Never worth evicting everything for a single oversized entry
+
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self.entry_size(self._entries.pop(key))
+            self._entries[key] = value
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= self.entry_size(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
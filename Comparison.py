@@ -0,0 +1,68 @@
+from PyQt5 import QtWidgets
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QHeaderView, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout
+
+COMPARISON_COLUMNS = ("Method", "MSE", "Max Error", "SNR (dB)", "Time (ms)")
+
+# Extra columns shown for float32 (compact) runs: the float64 MSE and the largest float32/float64 difference.
+PRECISION_COLUMNS = ("float64 MSE", "float32 Deviation")
+
+
+class ComparisonDialog(QtWidgets.QDialog):
+    """Side-by-side table of the error metrics and compute time of every reconstruction method."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Compare All Methods")
+        self.setGeometry(400, 250, 560, 300)
+        self.setStyleSheet("background-color: rgb(30,30,30); color: rgb(255, 255, 255);")
+
+        layout = QVBoxLayout()
+        self.summary = QLabel()
+        self.summary.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.summary)
+
+        self.table = QTableWidget(0, len(COMPARISON_COLUMNS))
+        self.table.setHorizontalHeaderLabels(COMPARISON_COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setStyleSheet("QHeaderView::section { background-color: rgb(15, 15, 15); "
+                                 "color: rgb(191, 191, 191); }")
+        layout.addWidget(self.table)
+
+        button = QPushButton("Close")
+        button.setStyleSheet("background-color: rgb(30, 30, 30); color: rgb(255, 255, 255);")
+        button.clicked.connect(self.accept)
+        layout.addWidget(button)
+
+        self.setLayout(layout)
+
+    def show_results(self, rows, shared_seconds, sampling_frequency, sampling_mode):
+        """
+        Fills the table with one row per method (dicts with method, mse, max_error, snr_db and seconds),
+        and a last row for the time of the work the methods shared. Rows of a float32 run also carry
+        float64_mse and float32_deviation, which are shown as the precision impact.
+        """
+        total = shared_seconds + sum(row["seconds"] for row in rows)
+        precision = bool(rows) and "float64_mse" in rows[0]
+        self.summary.setText(f"fs = {sampling_frequency} Hz ({sampling_mode}), one pass in {total * 1e3:.1f} ms"
+                             + (", float32 compact mode" if precision else ""))
+
+        columns = COMPARISON_COLUMNS + (PRECISION_COLUMNS if precision else ())
+        self.table.setColumnCount(len(columns))
+        self.table.setHorizontalHeaderLabels(columns)
+        self.table.setRowCount(len(rows) + 1)
+        for index, row in enumerate(rows):
+            snr = f"{row['snr_db']:.1f}" if row["snr_db"] is not None else "-"
+            values = (row["method"], f"{row['mse']:.3e}", f"{row['max_error']:.3e}", snr, f"{row['seconds'] * 1e3:.2f}")
+            if precision:
+                values += (f"{row['float64_mse']:.3e}", f"{row['float32_deviation']:.1e}")
+            for column, value in enumerate(values):
+                self.table.setItem(index, column, QTableWidgetItem(value))
+        self.table.setItem(len(rows), 0, QTableWidgetItem("Shared work"))
+        for column in range(1, len(columns)):
+            self.table.setItem(len(rows), column, QTableWidgetItem("-"))
+        self.table.setItem(len(rows), len(COMPARISON_COLUMNS) - 1, QTableWidgetItem(f"{shared_seconds * 1e3:.2f}"))
+        self.show()
+        self.raise_()
@@ -1,13 +1,52 @@
 import os
 import sys
+import tempfile
 import numpy as np
-import pandas as pd
 from PyQt5 import QtWidgets
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                             QHBoxLayout, QLabel, QLineEdit, QPushButton, QSlider)
+                             QHBoxLayout, QLabel, QLineEdit, QPushButton, QSlider, QComboBox)
 from PyQt5.QtCore import Qt
 
+import SignalIO
+
+DEFAULT_SAMPLE_RATE = 1000
+DEFAULT_DURATION = 1
+
+# Terms x samples evaluated per chunk; bounds the temporary memory of the synthesis to a few tens of MB.
+SYNTHESIS_CHUNK_ELEMENTS = 2 ** 20
+
+# Signals longer than this are synthesized into a memory-mapped .sig file instead of RAM.
+COMPOSER_IN_MEMORY_LIMIT = 2 ** 23
+
+# File formats offered by "Save Signal", with their extensions; both are written while synthesizing.
+SAVE_FORMATS = {"Binary (.sig)": ".sig", "CSV (.csv)": ".csv"}
+
+
+def signal_length(sample_rate, duration):
+    return int(sample_rate * duration)
+
+
+def synthesize_signal(frequencies, amplitudes, phases, sample_rate, duration,
+                      chunk_elements=SYNTHESIS_CHUNK_ELEMENTS):
+    """
+    Yields (start index, time, signal) chunks of sum(a * sin(2 pi f t + phase)) sampled at sample_rate.
+    The phasors e^(i 2 pi f k dt) of one chunk are computed once; each chunk is then one complex
+    matrix-vector product with the phasors of the terms at the chunk start, instead of one sin per term and sample.
+    """
+    count = signal_length(sample_rate, duration)
+    time_step = duration / count if count else 0.0
+    omega = 2 * np.pi * np.asarray(frequencies, dtype=float)
+    weights = np.asarray(amplitudes, dtype=float) * np.exp(1j * np.asarray(phases, dtype=float))
+    chunk = max(1, min(count, chunk_elements // max(1, len(omega))))
+    table = np.exp(1j * np.outer(omega, np.arange(chunk) * time_step))
+
+    for start in range(0, count, chunk):
+        length = min(chunk, count - start)
+        time = (start + np.arange(length)) * time_step  # Same instants as np.linspace(..., endpoint=False)
+        signal = (weights * np.exp(1j * omega * (start * time_step))) @ table[:, :length]
+        yield start, time, signal.imag
+
 
 class CustomMessageBox(QtWidgets.QDialog):
     def __init__(self, message):
@@ -65,6 +104,24 @@ class SignalComposer(QMainWindow):
         self.num_terms_input.setStyleSheet("background-color: rgb(15, 15, 15); color: rgb(255, 255, 255);")
         self.layout.addWidget(self.num_terms_input)
 
+        # Sample rate (Hz) and duration (s) of the generated signal
+        self.timing_layout = QHBoxLayout()
+        self.layout.addLayout(self.timing_layout)
+
+        self.sample_rate_input = QLineEdit(str(DEFAULT_SAMPLE_RATE))
+        self.sample_rate_input.setPlaceholderText("Sample Rate (Hz)")
+        self.sample_rate_input.setToolTip("Sample Rate (Hz)")
+        self.sample_rate_input.setFixedHeight(30)
+        self.sample_rate_input.setStyleSheet("background-color: rgb(15, 15, 15); color: rgb(255, 255, 255);")
+        self.timing_layout.addWidget(self.sample_rate_input)
+
+        self.duration_input = QLineEdit(str(DEFAULT_DURATION))
+        self.duration_input.setPlaceholderText("Duration (s)")
+        self.duration_input.setToolTip("Duration (s)")
+        self.duration_input.setFixedHeight(30)
+        self.duration_input.setStyleSheet("background-color: rgb(15, 15, 15); color: rgb(255, 255, 255);")
+        self.timing_layout.addWidget(self.duration_input)
+
         self.freq_amp_layout = QVBoxLayout()
         self.layout.addLayout(self.freq_amp_layout)
 
@@ -80,6 +137,12 @@ class SignalComposer(QMainWindow):
         self.action_buttons_layout = QHBoxLayout()
         self.layout.addLayout(self.action_buttons_layout)
 
+        self.save_format_input = QComboBox()
+        self.save_format_input.addItems(list(SAVE_FORMATS))
+        self.save_format_input.setStyleSheet("background-color: rgb(15, 15, 15); color: rgb(255, 255, 255);")
+        self.action_buttons_layout.addWidget(self.save_format_input)
+        self.save_format_input.hide()
+
         self.save_signal_button = QPushButton("Save Signal")
         self.save_signal_button.setStyleSheet(self.button_style())
         self.save_signal_button.clicked.connect(self.save_signal)
@@ -120,11 +183,19 @@ class SignalComposer(QMainWindow):
         self.num_terms_input.clear()
         self.generate_terms_button.show()
         self.save_signal_button.hide()
+        self.save_format_input.hide()
         self.use_signal_button.hide()
         self.num_terms_input.setReadOnly(False)
         self.setGeometry(850, 55, 315, 200)
 
     def validate_inputs(self):
+        try:
+            sample_rate, duration = float(self.sample_rate_input.text()), float(self.duration_input.text())
+        except ValueError:
+            return False, "Please enter valid numbers for the sample rate and the duration."
+        if sample_rate <= 0 or duration <= 0 or signal_length(sample_rate, duration) < 1:
+            return False, "Sample rate and duration must be positive and give at least one sample."
+
         for freq_input, amp_input, phase_input in zip(self.freq_inputs, self.amp_inputs, self.phase_inputs):
             freq_value = freq_input.text()
             amp_value = amp_input.text()
@@ -194,6 +265,7 @@ class SignalComposer(QMainWindow):
             self.generate_terms_button.hide()
             self.num_terms_input.setReadOnly(True)
             self.save_signal_button.show()
+            self.save_format_input.show()
             self.use_signal_button.show()
         except ValueError:
             self.show_error_message("Please enter a valid integer for the number of terms.")
@@ -210,10 +282,20 @@ class SignalComposer(QMainWindow):
         # Convert phase from degrees to radians, with a default of 0 radians if left empty
         phases = [np.radians(float(phase.text())) if phase.text() else 0.0 for phase in self.phase_inputs]
 
-        sample_rate = 1000
-        duration = 1
-        self.time, self.clean_signal = self.generate_clean_signal(frequencies, amplitudes, phases, sample_rate,
-                                                                  duration)
+        sample_rate, duration = float(self.sample_rate_input.text()), float(self.duration_input.text())
+        if signal_length(sample_rate, duration) > COMPOSER_IN_MEMORY_LIMIT:
+            # Too large for RAM: synthesize into a temporary memory-mapped file that disappears once unused
+            file_descriptor, file_name = tempfile.mkstemp(suffix=".sig", prefix="composed_signal_")
+            os.close(file_descriptor)
+            self.time, self.clean_signal = self.write_signal_file(file_name, frequencies, amplitudes, phases,
+                                                                  sample_rate, duration)
+            try:
+                os.remove(file_name)  # The memory maps keep the data alive (not allowed on Windows)
+            except OSError:
+                pass
+        else:
+            self.time, self.clean_signal = self.generate_clean_signal(frequencies, amplitudes, phases, sample_rate,
+                                                                      duration)
 
         if len(self.clean_signal) == 0 or len(self.time) == 0:
             return np.array([]), np.array([])
@@ -221,34 +303,92 @@ class SignalComposer(QMainWindow):
         return self.time, self.clean_signal
 
     def save_signal(self):
-        self.generate_signal()
-        if self.time is None or self.clean_signal is None:
+        valid, error_message = self.validate_inputs()
+        if not valid:
+            self.show_error_message(error_message)
             return
 
+        frequencies = [float(freq.text()) for freq in self.freq_inputs]
+        amplitudes = [float(amp.text()) for amp in self.amp_inputs]
+        phases = [np.radians(float(phase.text())) if phase.text() else 0.0 for phase in self.phase_inputs]
+        sample_rate, duration = float(self.sample_rate_input.text()), float(self.duration_input.text())
+
         # Define the base folder path and make sure the folder exists
         generated_signal_folder = "Data/Generated_Signal"
         os.makedirs(generated_signal_folder, exist_ok=True)
 
         # Create the base filename and save path
         base_filename = "generated_signal_" + "_".join(
-            [f"{freq}Hz" for freq in [float(freq.text()) for freq in self.freq_inputs]]
+            [f"{freq}Hz" for freq in frequencies]
         )
-        clean_path = os.path.join(generated_signal_folder, f"{base_filename}.csv")
-
-        # Save the DataFrame as CSV
-        clean_df = pd.DataFrame({'Time': self.time, 'Signal': self.clean_signal})
-        clean_df.to_csv(clean_path, index=False)
+        extension = SAVE_FORMATS[self.save_format_input.currentText()]
+        clean_path = os.path.join(generated_signal_folder, f"{base_filename}{extension}")
+
+        # Stream the signal to disk chunk by chunk as it is synthesized
+        if extension == ".sig":
+            self.write_signal_file(clean_path, frequencies, amplitudes, phases, sample_rate, duration)
+        else:
+            with open(clean_path, 'w', newline='') as file:
+                file.write("Time,Signal\n")
+                self._synthesize_into(None, None, frequencies, amplitudes, phases, sample_rate, duration,
+                                      csv_file=file)
         self.save_signal_button.setText("Saved")
 
     def generate_clean_signal(self, frequencies, amplitudes, phases, sample_rate, duration):
-        t = np.linspace(0, duration, int(sample_rate * duration), endpoint=False)
-        signal = np.zeros_like(t)
-
-        for freq, amp, phase in zip(frequencies, amplitudes, phases):
-            signal += amp * np.sin(2 * np.pi * freq * t + phase)
-
+        count = signal_length(sample_rate, duration)
+        t, signal = np.empty(count), np.empty(count)
+        self._synthesize_into(t, signal, frequencies, amplitudes, phases, sample_rate, duration)
         return t, signal
 
+    def write_signal_file(self, file_name, frequencies, amplitudes, phases, sample_rate, duration):
+        """Streams the signal into a native .sig file and returns its time and signal as memory maps."""
+        count = signal_length(sample_rate, duration)
+        metadata = {"sample_rate": sample_rate, "duration": duration,
+                    "terms": [list(term) for term in zip(frequencies, amplitudes, phases)]}
+        arrays = SignalIO.create_binary_signal(file_name, {"time": (np.float64, (count,)),
+                                                           "signal": (np.float64, (count,))}, metadata)
+        self._synthesize_into(arrays["time"], arrays["signal"], frequencies, amplitudes, phases, sample_rate,
+                              duration)
+        for array in arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+        return arrays["time"], arrays["signal"]
+
+    def _synthesize_into(self, time_out, signal_out, frequencies, amplitudes, phases, sample_rate, duration,
+                         csv_file=None):
+        """
+        Fills the output arrays, or appends CSV rows to csv_file, chunk by chunk, keeping the dialog
+        responsive on long signals. The Save and Use buttons are disabled meanwhile, so a click handled
+        between chunks cannot start another synthesis.
+        """
+        count = signal_length(sample_rate, duration)
+        chunk_elements, progress_threshold = SYNTHESIS_CHUNK_ELEMENTS, COMPOSER_IN_MEMORY_LIMIT // 8
+        if csv_file is not None:
+            # Formatting text is far slower than synthesis: smaller chunks keep the progress moving
+            chunk_elements = min(chunk_elements, SignalIO.CSV_WRITE_CHUNK_ROWS * max(1, len(frequencies)))
+            progress_threshold = 4 * SignalIO.CSV_WRITE_CHUNK_ROWS
+        show_progress = count > progress_threshold
+        button_text = self.save_signal_button.text()
+        action_buttons = (self.save_signal_button, self.use_signal_button)
+        for button in action_buttons:
+            button.setEnabled(False)
+        try:
+            for start, time, signal in synthesize_signal(frequencies, amplitudes, phases, sample_rate, duration,
+                                                         chunk_elements):
+                if csv_file is not None:
+                    SignalIO.write_csv_rows(csv_file, [time, signal])
+                else:
+                    time_out[start:start + len(time)] = time
+                    signal_out[start:start + len(signal)] = signal
+                if show_progress:
+                    self.save_signal_button.setText(f"{100 * (start + len(time)) // count}%")
+                    QApplication.processEvents()
+        finally:
+            for button in action_buttons:
+                button.setEnabled(True)
+            if show_progress:
+                self.save_signal_button.setText(button_text)
+
     def reset_operation(self):
         self.reset_state()
         self.hide()
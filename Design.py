@@ -48,6 +48,53 @@ class Ui_MainWindow(object):
         self.toggle_plot_button.setCursor(QCursor(Qt.PointingHandCursor))
         self.plot_contrlos_layout.addWidget(self.toggle_plot_button)
 
+        self.compare_all_button = QPushButton()
+        self.compare_all_button.setFont(font)
+        self.compare_all_button.setMaximumSize(QSize(110, 30))
+        self.compare_all_button.setStyleSheet("QPushButton {"
+                                              "background-color: rgb(15, 15, 15);"
+                                              "color:rgb(191, 191, 191);"
+                                              "}"
+                                              "QPushButton:hover{"
+                                              "background-color: rgb(25, 25, 25);"
+                                              "}")
+        self.compare_all_button.setCursor(QCursor(Qt.PointingHandCursor))
+        self.compare_all_button.setText("Compare All")
+        self.plot_contrlos_layout.addWidget(self.compare_all_button)
+
+        self.compact_mode_button = QPushButton()
+        self.compact_mode_button.setFont(font)
+        self.compact_mode_button.setMaximumSize(QSize(110, 30))
+        self.compact_mode_button.setCheckable(True)
+        self.compact_mode_button.setStyleSheet("QPushButton {"
+                                               "background-color: rgb(15, 15, 15);"
+                                               "color:rgb(191, 191, 191);"
+                                               "}"
+                                               "QPushButton:hover{"
+                                               "background-color: rgb(25, 25, 25);"
+                                               "}"
+                                               "QPushButton:checked{"
+                                               "background-color: rgb(45, 45, 45);"
+                                               "color:rgb(255, 255, 255);"
+                                               "}")
+        self.compact_mode_button.setCursor(QCursor(Qt.PointingHandCursor))
+        self.compact_mode_button.setText("Compact float32")
+        self.plot_contrlos_layout.addWidget(self.compact_mode_button)
+
+        self.export_button = QPushButton()
+        self.export_button.setFont(font)
+        self.export_button.setMaximumSize(QSize(110, 30))
+        self.export_button.setStyleSheet("QPushButton {"
+                                         "background-color: rgb(15, 15, 15);"
+                                         "color:rgb(191, 191, 191);"
+                                         "}"
+                                         "QPushButton:hover{"
+                                         "background-color: rgb(25, 25, 25);"
+                                         "}")
+        self.export_button.setCursor(QCursor(Qt.PointingHandCursor))
+        self.export_button.setText("Export")
+        self.plot_contrlos_layout.addWidget(self.export_button)
+
         # Create the frequency layout container
         self.frequency_layout = QHBoxLayout()
         self.frequency_layout.setObjectName(u"frequency_layout")
@@ -81,6 +128,30 @@ class Ui_MainWindow(object):
         # Add combo box to layout
         self.frequency_layout.addWidget(self.reconstruction_method)
 
+        # Sampling mode dropdown (exact-rate or integer-stride sampling)
+        self.sampling_mode = QComboBox(self.plot_contrlos_layoutWidget)
+        self.sampling_mode.setObjectName(u"sampling_mode")
+        self.sampling_mode.setSizePolicy(sizePolicy)
+        self.sampling_mode.setMaximumSize(QSize(140, 30))
+        self.sampling_mode.setFont(font)
+        self.sampling_mode.setCursor(QCursor(Qt.PointingHandCursor))
+        self.sampling_mode.setStyleSheet(u"background-color: rgb(15, 15, 15);\n"
+                                         "color: rgb(255, 255, 255);")
+        self.sampling_mode.setEditable(False)
+        self.frequency_layout.addWidget(self.sampling_mode)
+
+        # Displayed channel dropdown (multi-channel signals)
+        self.channel = QComboBox(self.plot_contrlos_layoutWidget)
+        self.channel.setObjectName(u"channel")
+        self.channel.setSizePolicy(sizePolicy)
+        self.channel.setMaximumSize(QSize(120, 30))
+        self.channel.setFont(font)
+        self.channel.setCursor(QCursor(Qt.PointingHandCursor))
+        self.channel.setStyleSheet(u"background-color: rgb(15, 15, 15);\n"
+                                   "color: rgb(255, 255, 255);")
+        self.channel.setEditable(False)
+        self.frequency_layout.addWidget(self.channel)
+
         # Sampling frequency slider
         self.sampling_frequency = QSlider(self.plot_contrlos_layoutWidget)
         self.sampling_frequency.setObjectName(u"sampling_frequency")
@@ -202,7 +273,7 @@ class Ui_MainWindow(object):
         # Main Buttons (Top-right: Upload Signal, Composer and Quit buttons)
         self.main_buttons_container = QWidget(self.centralwidget)
         self.main_buttons_container.setObjectName(u"main_buttons_container")
-        self.main_buttons_container.setGeometry(QRect(720, 5, 561, 51))
+        self.main_buttons_container.setGeometry(QRect(560, 5, 721, 51))
         self.main_buttons_container.setFont(font)
 
         # Button layout
@@ -239,6 +310,19 @@ class Ui_MainWindow(object):
                                            u"color:rgb(183, 255, 171); }")
         self.main_buttons_layout.addWidget(self.signal_composer)
 
+        # Live Stream button
+        self.live_stream = QPushButton(self.main_buttons_container)
+        self.live_stream.setObjectName(u"live_stream")
+        self.live_stream.setSizePolicy(sizePolicy1)
+        self.live_stream.setMaximumSize(QSize(200, 40))
+        self.live_stream.setFont(font)
+        self.live_stream.setCursor(QCursor(Qt.PointingHandCursor))
+        self.live_stream.setStyleSheet(u"QPushButton { border: none; padding: 10px; color: rgb(255, 255, 255); "
+                                       u"background-color: rgb(15,15,15); border-bottom: 2px solid transparent; } "
+                                       u"QPushButton:hover { border-bottom-color:rgb(255, 214, 125); "
+                                       u"color:rgb(255, 214, 125); }")
+        self.main_buttons_layout.addWidget(self.live_stream)
+
         # Quit Application button
         self.quit_app = QPushButton(self.main_buttons_container)
         self.quit_app.setObjectName(u"quit_app")
@@ -345,6 +429,7 @@ class Ui_MainWindow(object):
         self.title.setText(QCoreApplication.translate("MainWindow", u"Signal Reconstruction", None))
         self.upload_signal.setText(QCoreApplication.translate("MainWindow", u"Upload Signal", None))
         self.signal_composer.setText(QCoreApplication.translate("MainWindow", u"Composer", None))
+        self.live_stream.setText(QCoreApplication.translate("MainWindow", u"Live Stream", None))
         self.quit_app.setText(QCoreApplication.translate("MainWindow", u"Quit Application", None))
         self.groupBox.setTitle("")
         self.og_signal_label.setText(QCoreApplication.translate("MainWindow", u"Original Signal", None))
@@ -0,0 +1,139 @@
+import numpy as np
+from scipy.signal import find_peaks, lfilter
+
+# Coefficients of the four-term Blackman-Harris window. Its sidelobes stay below -92 dB, so weak components
+# are not hidden under the leakage of strong ones; the main lobe spans +-4 bins.
+BLACKMAN_HARRIS = (0.35875, 0.48829, 0.14128, 0.01168)
+
+# Peaks must reach this fraction of the strongest peak (-80 dB)...
+MIN_RELATIVE_HEIGHT = 1e-4
+
+# ...and stand this many times above the median spectrum level, which tracks the noise floor.
+NOISE_FLOOR_FACTOR = 10
+
+# Spacing, in bins, of the three Goertzel evaluations around a peak during refinement.
+REFINE_STEP = 0.05
+
+# Height above the noise floor at which a peak gets full confidence.
+FULL_CONFIDENCE_DB = 60
+
+# Samples windowed and filtered at once by the Goertzel refinement.
+GOERTZEL_CHUNK = 2 ** 16
+
+# Shorter signals have too few bins for the window and the interpolation.
+MIN_ESTIMATION_LENGTH = 16
+
+
+def windowed_spectrum(rfft, n):
+    """
+    Blackman-Harris windowed real spectrum of an n-point signal, obtained from its unwindowed rfft.
+    A sum-of-cosines window is a 7-tap convolution in frequency, so no second FFT is needed.
+    """
+    size = len(rfft)
+    # Bins past both ends through conjugate symmetry: X[-m] = X[n - m] = conj(X[m])
+    right = rfft[size - 2:size - 5:-1] if n % 2 == 0 else rfft[size - 1:size - 4:-1]
+    extended = np.concatenate([np.conj(rfft[3:0:-1]), rfft, np.conj(right)])
+
+    spectrum = BLACKMAN_HARRIS[0] * rfft
+    for offset, coefficient in enumerate(BLACKMAN_HARRIS[1:], start=1):
+        spectrum += (-1) ** offset * coefficient / 2 * (extended[3 - offset:3 - offset + size] +
+                                                        extended[3 + offset:3 + offset + size])
+    return spectrum
+
+
+def _parabola_vertex(left, center, right):
+    """Offset (in steps) and height of the vertex of the parabola through three equally spaced values."""
+    curvature = left - 2 * center + right
+    offset = 0.5 * (left - right) / curvature if curvature < 0 else 0.0
+    return offset, center - 0.25 * (left - right) * offset
+
+
+def goertzel_power(amplitude, bins):
+    """
+    Power of the Blackman-Harris windowed signal at fractional bin positions, with one Goertzel filter per bin.
+    Costs O(n) per bin and a bounded amount of memory, whatever the signal length.
+    """
+    n = len(amplitude)
+    coefficients = 2 * np.cos(2 * np.pi * np.asarray(bins, dtype=float) / n)
+    states = [np.zeros(2) for _ in coefficients]
+    last = [(0.0, 0.0) for _ in coefficients]
+    for start in range(0, n, GOERTZEL_CHUNK):
+        stop = min(n, start + GOERTZEL_CHUNK)
+        cosine = np.cos(2 * np.pi / n * np.arange(start, stop))
+        # cos(2x) and cos(3x) from cos(x), so the window costs one cosine per sample
+        window = (BLACKMAN_HARRIS[0] - BLACKMAN_HARRIS[1] * cosine + BLACKMAN_HARRIS[2] * (2 * cosine ** 2 - 1)
+                  - BLACKMAN_HARRIS[3] * cosine * (4 * cosine ** 2 - 3))
+        windowed = window * amplitude[start:stop]
+        for index, coefficient in enumerate(coefficients):
+            output, states[index] = lfilter([1.0], [1.0, -coefficient, 1.0], windowed, zi=states[index])
+            last[index] = (last[index][1] if len(output) == 1 else output[-2], output[-1])
+    return np.array([previous ** 2 + current ** 2 - coefficient * previous * current
+                     for (previous, current), coefficient in zip(last, coefficients)])
+
+
+def refine_peak(amplitude, bin_estimate, step=REFINE_STEP):
+    """
+    Zooms on a peak by evaluating the windowed spectrum at bin_estimate and step bins on either side with
+    the Goertzel algorithm, and returns the vertex of the log-power parabola as (bin, log power).
+    """
+    powers = goertzel_power(amplitude, [bin_estimate - step, bin_estimate, bin_estimate + step])
+    offset, log_power = _parabola_vertex(*np.log(np.maximum(powers, np.finfo(float).tiny)))
+    return bin_estimate + offset * step, log_power
+
+
+def estimate_frequencies(amplitude, time_step, rfft=None, max_frequencies=None, refine_peaks=1):
+    """
+    Estimates the dominant frequencies of a signal beyond the FFT bin spacing.
+    Peaks of the Blackman-Harris windowed spectrum are located to a fraction of a bin by log-parabolic
+    interpolation; the refine_peaks highest-frequency ones are then refined with a Goertzel zoom on the
+    signal itself. Pass the signal's cached rfft to avoid recomputing it.
+    Returns a dict with the 'frequencies' and their 'amplitudes' sorted by amplitude in descending order
+    (at most max_frequencies), the highest one as 'max_frequency' (None without peaks), the bin spacing
+    as 'resolution' and a 'confidence' in [0, 1] for max_frequency: 1 for a peak at least
+    FULL_CONFIDENCE_DB above the noise floor whose interpolated and refined positions agree, falling to 0
+    at the floor or when they differ by half a bin.
+    """
+    n = len(amplitude)
+    estimate = {"frequencies": np.empty(0), "amplitudes": np.empty(0), "max_frequency": None,
+                "resolution": 1 / (n * time_step) if n else None, "confidence": 0.0}
+    if n < MIN_ESTIMATION_LENGTH:
+        return estimate
+    if rfft is None:
+        rfft = np.fft.rfft(amplitude)
+
+    # Step 1: Windowed magnitude spectrum and the peaks that clear both thresholds
+    magnitude = np.abs(windowed_spectrum(rfft, n))
+    noise_floor = float(np.median(magnitude))
+    height = max(MIN_RELATIVE_HEIGHT * magnitude.max(), NOISE_FLOOR_FACTOR * noise_floor)
+    peaks, _ = find_peaks(magnitude, height=height if height > 0 else None)
+    if len(peaks) == 0:
+        return estimate
+
+    # Step 2: Sub-bin position and height from a parabola through the log magnitude of three bins
+    log_magnitude = np.log(np.maximum(magnitude, np.finfo(float).tiny))
+    bins, log_peaks = np.empty(len(peaks)), np.empty(len(peaks))
+    for index, peak in enumerate(peaks):
+        offset, log_peaks[index] = _parabola_vertex(*log_magnitude[peak - 1:peak + 2])
+        bins[index] = peak + offset
+
+    # Step 3: Goertzel refinement of the highest-frequency peaks, which set the Nyquist rate
+    shifts = np.zeros(len(peaks))  # Refined minus interpolated position, in bins
+    for index in np.argsort(bins)[::-1][:refine_peaks]:
+        refined_bin, log_power = refine_peak(amplitude, bins[index])
+        shifts[index] = refined_bin - bins[index]
+        if abs(shifts[index]) < 1:  # Keep the interpolation if the zoom slid to another lobe
+            bins[index], log_peaks[index] = refined_bin, 0.5 * log_power
+
+    # Step 4: Sort by amplitude (2 |X| / (n * coherent gain) for a sinusoid) and score the highest frequency
+    amplitudes = 2 * np.exp(log_peaks) / (n * BLACKMAN_HARRIS[0])
+    order = np.argsort(amplitudes)[::-1][:max_frequencies]
+    frequencies = bins[order] / (n * time_step)
+
+    top = np.argmax(bins[order])
+    prominence_db = 20 * np.log10(magnitude[peaks[order][top]] / max(noise_floor, np.finfo(float).tiny))
+    confidence = (min(1.0, max(0.0, prominence_db / FULL_CONFIDENCE_DB))
+                  * max(0.0, 1 - abs(shifts[order][top]) / 0.5))
+
+    estimate.update(frequencies=frequencies, amplitudes=amplitudes[order], max_frequency=float(frequencies[top]),
+                    confidence=float(confidence))
+    return estimate
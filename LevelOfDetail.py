@@ -0,0 +1,27 @@
+# Level-of-detail plotting: pyqtgraph re-reduces these items to the visible x-range whenever the view is
+# zoomed or panned, so drawing cost depends on the widget width rather than on the signal length.
+
+# Markers drawn per horizontal pixel of the visible range (about 600 markers in a 615 px wide plot).
+MARKERS_PER_PIXEL = 1.0
+
+
+def plot_curve(plot_widget, x, y, **kwargs):
+    """
+    Plots a line as a per-pixel min/max envelope of the data inside the visible x-range.
+    x must be sorted in increasing order.
+    """
+    item = plot_widget.plot(x, y, autoDownsampleFactor=1.0, **kwargs)
+    item.setDownsampling(auto=True, method='peak')
+    item.setClipToView(True)  # Set once the item is in the view box; passing it to plot() fails in pyqtgraph
+    return item
+
+
+def plot_markers(plot_widget, x, y, markers_per_pixel=MARKERS_PER_PIXEL, **kwargs):
+    """
+    Plots scatter markers, keeping every k-th point of the visible x-range so that no more than
+    about markers_per_pixel markers are drawn per pixel. x must be sorted in increasing order.
+    """
+    item = plot_widget.plot(x, y, pen=None, autoDownsampleFactor=markers_per_pixel, **kwargs)
+    item.setDownsampling(auto=True, method='subsample')
+    item.setClipToView(True)
+    return item
@@ -1,12 +1,38 @@
 import sys
-from PyQt5.QtCore import QRect
-from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox
+import os
+import time as clock
+from PyQt5.QtCore import QRect, QTimer, Qt
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtWidgets import QApplication, QMainWindow, QFileDialog, QMessageBox, QInputDialog, QLabel, QShortcut
 from pyqtgraph import PlotWidget
 import numpy as np
 from Design import Ui_MainWindow
 import Composer
+import Reconstruction
+import Sampling
+import SignalIO
+import Analysis
+import Worker
+import LevelOfDetail
+import Streaming
+import Profiling
+import Comparison
+import Precision
+import Noise
+import Pipeline
 from Composer import SignalComposer, CustomMessageBox
-from scipy.signal import find_peaks
+
+# Visible window of the frequency domain plot (Hz)
+SPECTRUM_X_RANGE = (-300, 300)
+
+# Polling interval of the live stream source (ms)
+STREAM_UPDATE_MS = 50
+
+# Refresh interval of the stage timing overlay (ms); F12 toggles the overlay and the instrumentation
+PROFILE_OVERLAY_UPDATE_MS = 500
+
+# Pipeline stages that draw the plots; every refresh brings these up to date
+RENDER_STAGES = ("render signal", "render reconstruction", "render difference", "render spectrum")
 
 
 class MainWindow(QMainWindow):
@@ -21,6 +47,8 @@ class MainWindow(QMainWindow):
         self.toggle_plot_mode_button_name()
         self.is_reconstructed = False  # Flag to indicate if signal is reconstructed
         self.frequency_ratio_mode = False
+        self.compact_mode = False  # float32 amplitudes and reused output buffers
+        self.buffers = Precision.BufferPool()
 
         self.composer = Composer.SignalComposer(self)
         self.error_object = CustomMessageBox(self)
@@ -28,13 +56,16 @@ class MainWindow(QMainWindow):
         # Set up plot widgets
         self.setup_plot_widgets()
 
+        # Reconstructions requested by the sliders run in the background and come back through result_ready
+        self.reconstruction_scheduler = Worker.ReconstructionScheduler(self)
+        self.reconstruction_scheduler.result_ready.connect(self.show_reconstruction)
+
         # Add items to the combo box
-        self.ui.reconstruction_method.addItems([
-            "Sinc Interpolation",
-            "Zero-Order Hold",
-            "Lanczos Resampling"
-        ])
+        self.ui.reconstruction_method.addItems(list(Reconstruction.RECONSTRUCTION_METHODS))
         self.ui.reconstruction_method.setCurrentIndex(0)
+        self.ui.sampling_mode.addItems(list(Sampling.SAMPLING_MODES))
+        self.ui.sampling_mode.setCurrentText(Sampling.DEFAULT_SAMPLING_MODE)
+        self.setup_pipeline()
 
         # Connect the "Upload Signal" button to the upload_signal function
         self.ui.upload_signal.clicked.connect(self.upload_signal)
@@ -45,15 +76,108 @@ class MainWindow(QMainWindow):
 
         # Connect combo box to method
         self.ui.reconstruction_method.currentIndexChanged.connect(self.update_reconstruction_method)
+        self.ui.sampling_mode.currentIndexChanged.connect(self.update_sampling)
+        self.ui.channel.currentIndexChanged.connect(self.update_channel)
         self.ui.signal_composer.clicked.connect(self.open_signal_composer)
         self.ui.toggle_plot_button.clicked.connect(self.toggle_plot_mode)
         self.ui.set_min_valid_frequency.clicked.connect(self.set_min_valid_frequency)
+        self.ui.live_stream.clicked.connect(self.toggle_live_stream)
+        self.ui.compare_all_button.clicked.connect(self.compare_all_methods)
+        self.ui.compact_mode_button.toggled.connect(self.toggle_compact_mode)
+        self.ui.export_button.clicked.connect(self.export_signals)
+        self.comparison_dialog = Comparison.ComparisonDialog(self)
+
+        # Live streaming polls its source on a timer while active
+        self.stream_source = None
+        self.stream_timer = QTimer(self)
+        self.stream_timer.timeout.connect(self.update_live_stream)
+
+        self.setup_profiling_overlay()
+        self.request_time = None  # When the pending slider request was made, for the end-to-end timing
 
         self.load_signal_data("Data/signal_5Hz_20Hz_50Hz.csv")
 
         # Run initial reconstruction with the selected method
         self.update_reconstruction_method
 
+    def setup_pipeline(self):
+        """
+        Organizes the processing as a stage graph: load/analysis -> sample -> reconstruct -> noise -> error -> render.
+        Each control sets one input, so only the stages downstream of it are recomputed and redrawn:
+        the SNR never resamples or reconstructs, the method keeps the samples and the spectrum, and the plot
+        mode only redraws the difference plot. Sampling and reconstruction run on the background worker.
+        """
+        self.snr = self.ui.SNR_level.value()
+        self.current_sample_frequency = self.ui.sampling_frequency.value()
+        pipeline = self.pipeline = Pipeline.StageGraph()
+        pipeline.add_input("channels")  # MultiChannelSignal of the loaded signal, sampled and reconstructed as a whole
+        pipeline.add_input("channel", 0)  # Index of the displayed channel
+        pipeline.add_input("signal")  # SignalAnalysis of the displayed channel
+        pipeline.add_input("sampling", (self.current_sample_frequency, self.ui.sampling_mode.currentText()))
+        pipeline.add_input("method", self.ui.reconstruction_method.currentText())
+        pipeline.add_input("snr", self.snr)
+        pipeline.add_input("plot mode", self.plot_difference_mode)
+
+        pipeline.add_stage("samples", self.compute_samples, ("channels", "sampling"), background=True)
+        pipeline.add_stage("reconstruction", self.compute_reconstruction,
+                           ("channels", "sampling", "samples", "method"), background=True)
+        # Switching channels only picks another column of the batched results
+        pipeline.add_stage("channel samples", lambda samples, channel: (samples[0], samples[1][:, channel]),
+                           ("samples", "channel"))
+        pipeline.add_stage("channel reconstruction", lambda reconstruction, channel: reconstruction[:, channel],
+                           ("reconstruction", "channel"))
+        pipeline.add_stage("signal noise", self.compute_signal_noise, ("signal", "snr"))
+        pipeline.add_stage("reconstruction noise", self.compute_reconstruction_noise,
+                           ("signal", "sampling", "channel reconstruction", "signal noise"))
+        pipeline.add_stage("error", self.compute_error, ("signal noise", "reconstruction noise"))
+
+        pipeline.add_stage("render signal", self.render_signal, ("signal noise", "channel samples"))
+        pipeline.add_stage("render reconstruction", self.render_reconstruction, ("method", "reconstruction noise"))
+        # The difference plot copies the ranges of the signal plot, so it follows the other two plots
+        pipeline.add_stage("render difference", self.update_difference_plot,
+                           ("error", "plot mode", "render signal", "render reconstruction"))
+        pipeline.add_stage("render spectrum", lambda analysis, sampling: self.plot_sampled_spectrum(sampling[0]),
+                           ("signal", "sampling"))
+
+    # Outputs of the pipeline stages, as used by the plots, the export and the comparison
+    @property
+    def t_sampled(self):
+        return self.pipeline.value("channel samples")[0]
+
+    @property
+    def amplitude_sampled(self):
+        return self.pipeline.value("channel samples")[1]
+
+    @property
+    def reconstructed_signal(self):
+        return self.pipeline.value("channel reconstruction")
+
+    @property
+    def reconstructed_signal_noisy(self):
+        return self.pipeline.value("reconstruction noise")
+
+    @property
+    def noisy_signal(self):
+        return self.pipeline.value("signal noise")[0]
+
+    @property
+    def noise_power(self):
+        return self.pipeline.value("signal noise")[1]
+
+    def refresh(self, run_background=False):
+        """
+        Recomputes the dirty pipeline stages and redraws the plots that changed. Stages that wait for the
+        background worker are left for show_reconstruction, unless run_background computes them here.
+        """
+        if self.pipeline.value("signal") is None or self.stream_source is not None:
+            return []
+        ran = self.pipeline.update(RENDER_STAGES, run_background)
+        if self.request_time is not None and not self.pipeline.waiting(RENDER_STAGES):
+            if Profiling.PROFILER.enabled:
+                Profiling.PROFILER.record("end-to-end", clock.perf_counter() - self.request_time)
+            self.request_time = None
+        return ran
+
     def open_signal_composer(self):
         self.composer.show()  # Use show() instead of exec_()
 
@@ -73,13 +197,48 @@ class MainWindow(QMainWindow):
         self.plot_widget_4 = PlotWidget(self.ui.groupBox_4)
         self.plot_widget_4.setGeometry(QRect(3, 30, 615, 280))
 
+    def setup_profiling_overlay(self):
+        """
+        Creates the stage timing overlay, hidden until F12 is pressed. It shows rolling percentiles of
+        every instrumented stage; set NYQUIST_PROFILE_LOG to also log each timing as a JSON line.
+        """
+        self.profiling_overlay = QLabel(self)
+        self.profiling_overlay.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 180); color: rgb(180, 255, 180); font-family: monospace; padding: 6px;")
+        self.profiling_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.profiling_overlay.hide()
+
+        self.profiling_timer = QTimer(self)
+        self.profiling_timer.timeout.connect(self.update_profiling_overlay)
+        self.profiling_shortcut = QShortcut(QKeySequence(Qt.Key_F12), self)
+        self.profiling_shortcut.activated.connect(self.toggle_profiling_overlay)
+        if Profiling.PROFILER.enabled:
+            self.toggle_profiling_overlay()
+
+    def toggle_profiling_overlay(self):
+        if not self.profiling_overlay.isHidden():
+            self.profiling_overlay.hide()
+            self.profiling_timer.stop()
+            Profiling.PROFILER.enabled = Profiling.PROFILER.logging  # Keep timing while a log file is open
+            return
+        Profiling.PROFILER.enabled = True
+        self.update_profiling_overlay()
+        self.profiling_overlay.show()
+        self.profiling_overlay.raise_()
+        self.profiling_timer.start(PROFILE_OVERLAY_UPDATE_MS)
+
+    def update_profiling_overlay(self):
+        self.profiling_overlay.setText(Profiling.PROFILER.report())
+        self.profiling_overlay.adjustSize()
+        self.profiling_overlay.move(self.width() - self.profiling_overlay.width() - 10, 70)
+
     def upload_signal(self):
         options = QFileDialog.Options()
         file_name, _ = QFileDialog.getOpenFileName(
             self,
             "Select Signal File",
             "",
-            "CSV Files (*.csv);;Text Files (*.txt);;All Files (*)",
+            "Signal Files (*.csv *.sig *.npy);;CSV Files (*.csv);;Text Files (*.txt);;All Files (*)",
             options=options
         )
 
@@ -93,50 +252,87 @@ class MainWindow(QMainWindow):
         try:
 
             # Load the signal data from the file
-            data = np.loadtxt(file_name, delimiter=',', skiprows=1)
-            if data.shape[1] != 2:
-                raise ValueError("File must contain exactly two columns: Time and Signal.")
-
-            time = data[:, 0]
-            amplitude = data[:, 1]
+            time, amplitude, channel_names = SignalIO.load_signal_channels(file_name)
 
             # Pass the time and amplitude to the processing function
-            self.process_signal_data(time, amplitude)
+            self.process_signal_data(time, amplitude, channel_names=channel_names)
 
         except IOError:
             self.show_error_message("Error opening the file. Please check the file path.")
         except ValueError as ve:
             self.show_error_message(str(ve))
 
-    def process_signal_data(self, time, amplitude):
+    def process_signal_data(self, time, amplitude, sampling_frequency=None, channel_names=None):
+        """
+        Loads a signal as one transaction: the signal is analyzed and validated before any window state
+        changes, so a rejected signal leaves the previous one in place. Then the sliders are moved with their
+        signals blocked, every new parameter is set on the pipeline at once, and the pipeline runs a single
+        reconstruction and a single render of each plot. pipeline.runs counts the recomputations of each stage.
+        Parameters:
+            - amplitude: (N,) for one channel, or (N, channels) for channels sharing the time axis.
+            - sampling_frequency: Sampling frequency to start from (default: the slider minimum).
+            - channel_names: Names shown in the channel dropdown.
+        """
+        controls = (self.ui.sampling_frequency, self.ui.SNR_level, self.ui.channel)
         try:
-            # Assign the time and amplitude data
+            # Analyze the new signal first; nothing of the window changes until it is known to be usable
+            channels = Precision.as_working(np.reshape(amplitude, (len(amplitude), -1)), self.compact_mode)
+            signal = Analysis.MultiChannelSignal(time, channels, channel_names)
+            if signal.frequency_estimate["max_frequency"] is None:
+                raise ValueError("No dominant frequency found in the signal.")
+
+            # Assign the time and amplitude data, keeping the loaded arrays to switch precision later
+            self.source_signal = (time, amplitude)
             self.time = time
-            self.amplitude = amplitude
-
-            # Call print_frequencies to analyze and print frequencies
+            self.buffers.clear()
+            # Replaces the cache of the previous signal; the first channel is displayed
+            self.signal = signal
+            self.analysis = self.signal.channel(0)
+            self.amplitude = self.analysis.amplitude
+            self.reconstruction_scheduler.cancel()
+            self.reconstruction_scheduler.cache.clear()  # Reconstructions of the previous signal are never reused
+
+            # Step 1: Move the controls without triggering their per-change updates
+            for control in controls:
+                control.blockSignals(True)
+            self.ui.channel.clear()
+            self.ui.channel.addItems(self.signal.names)
+
+            # Call print_frequencies to analyze and print frequencies (resizes the sampling slider)
             self.print_frequencies()
 
-            # Plot the signal data
-            self.plot_signal()
-
             # Automatically set initial sampling frequency
-            initial_sampling_frequency = self.ui.sampling_frequency.minimum()
-            self.ui.sampling_frequency.setValue(initial_sampling_frequency)
-            self.update_sampling_frequency(initial_sampling_frequency)
-
-            # Set the SNR slider to its minimum value
-            max_snr_value = self.ui.SNR_level.maximum()
-            self.ui.SNR_level.setValue(max_snr_value)
-            self.update_snr(max_snr_value)
-
-            # Automatically reconstruct after signal upload
+            if sampling_frequency is None:
+                sampling_frequency = self.ui.sampling_frequency.minimum()
+            self.ui.sampling_frequency.setValue(sampling_frequency)
+            self.current_sample_frequency = self.ui.sampling_frequency.value()
+            print(f"Updating Sampling Frequency (Hz): {self.current_sample_frequency}")
+            self.update_frequency_mode()
+
+            # Set the SNR slider to its maximum value
+            self.ui.SNR_level.setValue(self.ui.SNR_level.maximum())
+            self.snr = self.ui.SNR_level.value()
+            print("Current SNR (dB):", self.snr)
+            self.ui.SNR_value_label.setText(f"{self.snr}%")
+
+            # Step 2: Apply all the new parameters to the pipeline at once
+            self.pipeline.set("channels", self.signal)
+            self.pipeline.set("channel", 0)
+            self.pipeline.set("signal", self.analysis)
+            self.pipeline.set("sampling", (self.current_sample_frequency, self.ui.sampling_mode.currentText()))
+            self.pipeline.set("snr", self.snr)
+
+            # Step 3: Reconstruct and render once
             self.sample_and_reconstruct_signal()
+            self.plot_widget_4.setXRange(*SPECTRUM_X_RANGE)
 
         except ValueError:
             self.show_error_message(
                 "Error processing signal data. Please ensure it is formatted correctly with 'Time,Signal' values."
             )
+        finally:
+            for control in controls:
+                control.blockSignals(False)
 
     def use_signal(self):
         time_data, amplitude_data = self.composer.generate_signal()
@@ -151,43 +347,23 @@ class MainWindow(QMainWindow):
         self.process_signal_data(time_data, amplitude_data)
         self.composer.reset_operation()
 
-    def plot_signal(self):
-        # Clear and plot the signal data
-        self.plot_widget_1.clear()
-        self.plot_widget_1.plot(self.time, self.amplitude, pen='b')
-        # frequency domain
-        time_step = np.mean(np.diff(self.time))
-
-        n = len(self.amplitude)
-        amplitude_fft = np.fft.fft(self.amplitude)
-        frequencies = np.fft.fftfreq(n, d=time_step)
-
-        # positive_freqs = frequencies[:n // 2]
-        # magnitude = np.abs(amplitude_fft[:n // 2])
-
-        self.plot_widget_4.clear()
-        self.plot_widget_4.plot(frequencies, np.abs(amplitude_fft) / n, pen='r')
-
-        self.plot_widget_4.setXRange(-300, 300)
-
-    def add_noise(self, snr_db):
+    def compute_signal_noise(self, analysis, snr_db):
         """
-        Adds noise to the signal based on the specified SNR (dB).
+        Adds noise to the signal based on the specified SNR (dB); returns the noisy signal and the noise power.
         """
         # Calculate signal power and noise power based on SNR
-        signal_power = np.mean(self.amplitude ** 2)
+        signal_power = analysis.power
         snr_linear = 10 ** (snr_db / 20)
         noise_power = signal_power / snr_linear
 
-        # Generate white Gaussian noise
-        noise = np.random.normal(0, np.sqrt(noise_power), self.amplitude.shape)
-
-        # Add noise to the signal
-        self.noisy_signal = self.amplitude + noise
+        with Profiling.PROFILER.stage("signal noise"):
+            # Scale the cached unit noise realization straight into the reused noisy signal buffer
+            noisy_signal = self.buffers.get("noisy_signal", len(self.amplitude), self.amplitude.dtype)
+            noise, measured_noise_power = Noise.NOISE.scaled("signal", len(self.amplitude), np.sqrt(noise_power),
+                                                             self.amplitude.dtype, out=noisy_signal)
 
-        # Clear plot and show noisy signal
-        self.plot_widget_1.clear()
-        self.plot_widget_1.plot(self.time, self.noisy_signal, pen='b', name='Noisy Signal')
+            # Add noise to the signal
+            return np.add(noise, self.amplitude, out=noisy_signal), measured_noise_power
 
     def update_snr(self, value):
         """
@@ -196,10 +372,9 @@ class MainWindow(QMainWindow):
         self.snr = value
         print("Current SNR (dB):", self.snr)
 
-        # Re-generate the noisy signal with updated SNR
-        if hasattr(self, 'time') and hasattr(self, 'amplitude'):
-            self.add_noise(self.snr)
-            self.sample_and_reconstruct_signal()  # Trigger signal sampling and reconstruction
+        # Re-generate the noisy signal with updated SNR; the clean samples and reconstruction are kept
+        if self.pipeline.set("snr", self.snr):
+            self.refresh()
         # Update the SNR value label to show the current SNR as a percentage
         self.ui.SNR_value_label.setText(f"{self.snr}%")  # Update the label with the current value
 
@@ -210,40 +385,24 @@ class MainWindow(QMainWindow):
         error_dialog.setText(message)
         error_dialog.exec_()
 
-    def print_frequencies(self, threshold=0.1, max_frequencies=None):
+    def print_frequencies(self, max_frequencies=None):
         """
-        Calculates and prints the dominant frequencies in the uploaded signal.
+        Estimates and prints the dominant frequencies in the uploaded signal, and sets the highest one as the
+        signal's maximum frequency. With several channels, the estimate of the channel with the highest
+        frequency is used, since all channels share the sampling. The estimate is cached with the signal.
         Parameters:
-            - threshold: Minimum magnitude to consider a frequency as dominant.
             - max_frequencies: Maximum number of dominant frequencies to print (set to None for all).
         """
         if hasattr(self, 'time') and hasattr(self, 'amplitude'):
-            time_step = np.mean(np.diff(self.time))
-            sampling_rate = 1 / time_step
-
-            n = len(self.amplitude)
-            amplitude_fft = np.fft.fft(self.amplitude)
-            frequencies = np.fft.fftfreq(n, d=time_step)
-
-            positive_freqs = frequencies[:n // 2]
-            magnitude = np.abs(amplitude_fft[:n // 2])
-
-            # Identify peaks and filter by threshold
-            peaks, _ = find_peaks(magnitude, height=threshold)
-            peak_freqs = positive_freqs[peaks]
-            peak_magnitudes = magnitude[peaks]
-
-            # Sort frequencies by magnitude in descending order
-            sorted_indices = np.argsort(peak_magnitudes)[::-1]
-
-            # Select top frequencies based on max_frequencies or print all above threshold
-            if max_frequencies:
-                dominant_frequencies = peak_freqs[sorted_indices][:max_frequencies]
-            else:
-                dominant_frequencies = peak_freqs[sorted_indices]
+            estimate = self.signal.frequency_estimate
+            if estimate["max_frequency"] is None:
+                raise ValueError("No dominant frequency found in the signal.")
             # Print the dominant frequencies
-            self.max_signal_frequeny = max(dominant_frequencies)
-            self.max_slide_frequency = int(4 * max(dominant_frequencies))
+            print("Dominant frequencies (Hz):", np.round(estimate["frequencies"][:max_frequencies], 4))
+            print(f"Maximum frequency: {estimate['max_frequency']:.4f} Hz "
+                  f"(bin spacing {estimate['resolution']:.4g} Hz, confidence {estimate['confidence']:.2f})")
+            self.max_signal_frequeny = estimate["max_frequency"]
+            self.max_slide_frequency = max(1, round(4 * self.max_signal_frequeny))
             self.ui.sampling_frequency.setRange(1, self.max_slide_frequency)
 
     def update_sampling_frequency(self, value):
@@ -256,8 +415,8 @@ class MainWindow(QMainWindow):
         # Update button display
         self.update_frequency_mode()
 
-        # Process the signal based on the updated sampling frequency
-        self.sample_and_reconstruct_signal()
+        # Process the signal based on the updated sampling frequency on the background worker
+        self.update_sampling()
 
         # Explicitly synchronize the slider if necessary
         if self.ui.sampling_frequency.value() != self.current_sample_frequency:
@@ -297,96 +456,155 @@ class MainWindow(QMainWindow):
             percentage = round(self.current_sample_frequency / self.max_signal_frequeny * 100)
             self.ui.frequency_value_label_button.setText(f"{percentage}%")
 
+    def update_channel(self, index):
+        """
+        Displays another channel. Every channel was sampled and reconstructed in the same batch, so only
+        the noise, the error and the plots of the new channel are recomputed.
+        """
+        if self.pipeline.value("channels") is None or index < 0:
+            return
+        self.analysis = self.signal.channel(index)
+        self.amplitude = self.analysis.amplitude
+        self.pipeline.set("signal", self.analysis)
+        self.pipeline.set("channel", index)
+        self.refresh()
+
+    def update_sampling(self):
+        """Sets the sampling frequency and mode of the pipeline; resampling runs on the background worker."""
+        sampling = (self.current_sample_frequency, self.ui.sampling_mode.currentText())
+        if self.pipeline.set("sampling", sampling):
+            self.request_reconstruction()
+            self.refresh()  # The spectrum only depends on the sampling frequency and is drawn right away
+
+    def reconstruction_job(self):
+        """Snapshot of everything a reconstruction needs, so it can run away from the GUI thread."""
+        return {
+            "time": self.time,
+            "amplitude": self.signal.amplitude,  # Every channel, reconstructed in one batch
+            "time_step": self.signal.time_step,
+            "method": self.ui.reconstruction_method.currentText(),  # Get selected text from combo box
+            "sampling_frequency": self.current_sample_frequency,
+            "max_slide_frequency": self.max_slide_frequency,
+            "signal_id": self.signal.signal_id,
+            "sampling_mode": self.ui.sampling_mode.currentText(),
+        }
+
+    def request_reconstruction(self):
+        """Queues a background reconstruction for the current parameters; older queued requests are dropped."""
+        if self.pipeline.value("signal") is None:
+            return  # No data to process
+        if self.stream_source is not None:
+            return  # The live stream reads the controls itself on its next update
+        if self.request_time is None:
+            self.request_time = clock.perf_counter()  # Latency is measured from the first request of a burst
+        self.reconstruction_scheduler.request(self.reconstruction_job())
+
     def sample_and_reconstruct_signal(self):
+        """Brings every stage up to date right away, computing the background stages on this thread."""
         # Ensure that original data exists
-        if not hasattr(self, 'time') or not hasattr(self, 'amplitude') or not hasattr(self, 'noisy_signal'):
+        if self.pipeline.value("signal") is None:
             return  # No data to process
-
-        # Step 1: Calculate Sampling Interval from Frequency
-        time_step = np.mean(np.diff(self.time))  # Time step of original data
-        sampling_interval = max(1, int(1 / (self.current_sample_frequency * time_step)))  # Interval in terms of indices
-
-        # Step 2: Downsample the Signal
-        self.t_sampled = self.time[::sampling_interval]  # Take samples at intervals
-        self.amplitude_sampled = self.amplitude[::sampling_interval]
-
-        # Step 3: Determine reconstruction method based on combo box selection
-        t_interp = self.time  # High-resolution time array for reconstruction
-        selected_method = self.ui.reconstruction_method.currentText()  # Get selected text from combo box
-
-        if selected_method == "Sinc Interpolation":
-            self.reconstructed_signal = self.sinc_interpolation(self.t_sampled, self.amplitude_sampled, t_interp)
-        elif selected_method == "Zero-Order Hold":
-            self.reconstructed_signal = self.zero_order_hold_interpolation(self.t_sampled, self.amplitude_sampled,
-                                                                           t_interp)
-        elif selected_method == "Lanczos Resampling":
-            self.reconstructed_signal = self.lanczos_resampling(self.t_sampled, self.amplitude_sampled, t_interp)
-        else:
-            print(f"Reconstruction method '{selected_method}' not recognized.")
-            self.reconstructed_signal = np.zeros_like(t_interp)  # Fallback if no method matches
-
-        # Step 4: Calculate the Original SNR
-        # self.noisy_signal contains the original signal with noise
-        signal_power = np.mean(self.amplitude ** 2)  # Power of the clean signal
-        noise_power = np.mean(
-            (self.noisy_signal - self.amplitude) ** 2)  # Power of the noise in the original noisy signal
-        original_snr_linear = signal_power / noise_power  # Original SNR in linear scale
-        original_noise_power = signal_power / original_snr_linear
-
-        noise_scale = 1 - (self.current_sample_frequency / self.max_slide_frequency)
-        print(f"Noise Scale is {noise_scale * 100}%")
-
-        # Step 5: Add noise to the reconstructed signal based on original SNR
-        noise = np.random.normal(0, np.sqrt(original_noise_power * noise_scale), self.reconstructed_signal.shape)
-        self.reconstructed_signal_noisy = self.reconstructed_signal + noise
-
+        if self.stream_source is not None:
+            return  # The plots belong to the live stream
+
+        self.reconstruction_scheduler.cancel()  # A synchronous update supersedes any background job
+        self.request_time = clock.perf_counter()
+        self.refresh(run_background=True)
+
+    def compute_samples(self, signal, sampling):
+        sampling_frequency, sampling_mode = sampling
+        with Profiling.PROFILER.stage("decimation"):
+            return Sampling.sample_signal(signal.time, signal.amplitude, sampling_frequency, signal.time_step,
+                                          sampling_mode)
+
+    def compute_reconstruction(self, signal, sampling, samples, method):
+        sampling_frequency, sampling_mode = sampling
+        return Worker.sample_and_reconstruct(signal.time, signal.amplitude, signal.time_step, method,
+                                             sampling_frequency, self.reconstruction_scheduler.cache,
+                                             signal.signal_id, sampling_mode, sampled=samples)["reconstructed_signal"]
+
+    def compute_reconstruction_noise(self, analysis, sampling, reconstructed_signal, signal_noise):
+        _, noise_power = signal_noise
+        return Worker.reconstruction_noise(reconstructed_signal, noise_power, analysis.power, sampling[0],
+                                           self.max_slide_frequency)
+
+    def compute_error(self, signal_noise, reconstructed_signal_noisy):
+        """Difference between the noisy signal and its noisy reconstruction, in a reused buffer."""
+        noisy_signal, _ = signal_noise
+        return np.subtract(noisy_signal, reconstructed_signal_noisy,
+                           out=self.buffers.get("difference", len(noisy_signal), noisy_signal.dtype))
+
+    def show_reconstruction(self, result):
+        """
+        Hands a background sampling and reconstruction result to the pipeline and redraws what depends on it.
+        Render timings cover building the plot items; Qt paints them on the next repaint.
+        """
+        if (result["method"] != self.pipeline.value("method") or
+                (result["sampling_frequency"], result["sampling_mode"]) != self.pipeline.value("sampling")):
+            return  # Superseded by a newer request that is still running
+        if self.pipeline.is_dirty("samples"):  # A method change reuses the samples already drawn
+            self.pipeline.provide("samples", (result["t_sampled"], result["amplitude_sampled"]))
+        self.pipeline.provide("reconstruction", result["reconstructed_signal"])
+        self.refresh()
+
+    def render_signal(self, signal_noise, samples):
         # Step 6: Plot Original, Sampled, and Noisy Reconstructed Signals
-        self.plot_widget_1.clear()  # Clear original signal plot
-        self.plot_widget_1.plot(self.time, self.noisy_signal, pen='b', name='Noisy Signal')
-        self.plot_widget_1.plot(
-            self.t_sampled,
-            self.amplitude_sampled,
-            pen=None,
-            symbol='o',
-            symbolBrush='r',
-            symbolSize=2.5,
-            name='Sampled Points'
-        )
-        self.plot_widget_3.clear()
-
-        # if self.current_sample_frequency <= 2 * self.max_signal_frequeny:
-        #     self.current_reconstructed_signal = self.reconstructed_signal_noisy
-        # else:
-        #     self.current_reconstructed_signal = self.reconstructed_signal
-
-        self.plot_widget_3.plot(t_interp, self.reconstructed_signal_noisy, pen='g',
-                                name='Reconstructed Signal')
+        noisy_signal, _ = signal_noise
+        t_sampled, amplitude_sampled = samples
+        with Profiling.PROFILER.stage("render signal"):
+            self.plot_widget_1.clear()  # Clear original signal plot
+            LevelOfDetail.plot_curve(self.plot_widget_1, self.time, noisy_signal, pen='b', name='Noisy Signal')
+            LevelOfDetail.plot_markers(
+                self.plot_widget_1,
+                t_sampled,
+                amplitude_sampled,
+                symbol='o',
+                symbolBrush='r',
+                symbolSize=2.5,
+                name='Sampled Points'
+            )
 
-        self.update_difference_plot()
+    def render_reconstruction(self, method, reconstructed_signal_noisy):
+        self.update_reconstruction_report(method)
+        with Profiling.PROFILER.stage("render reconstruction"):
+            self.plot_widget_3.clear()
+            LevelOfDetail.plot_curve(self.plot_widget_3, self.time, reconstructed_signal_noisy, pen='g',
+                                     name='Reconstructed Signal')
 
-        # Define the number of repetitions and the bandwidth
-        time_step = np.mean(np.diff(self.time))
+    def plot_sampled_spectrum(self, sampling_frequency):
+        """
+        Draws the periodic spectrum of the sampled signal over the visible frequency range, its folded
+        image inside +-fs/2, the original spectrum, and markers on the aliased components.
+        """
+        with Profiling.PROFILER.stage("spectrum"):
+            spectrum = self.analysis.sampled_spectrum(sampling_frequency, SPECTRUM_X_RANGE)
+        with Profiling.PROFILER.stage("render spectrum"):
+            self.draw_sampled_spectrum(spectrum)
 
-        n = len(self.amplitude)
-        amplitude_fft = np.fft.fft(self.amplitude)
-        frequencies = np.fft.fftfreq(n, d=time_step)
+    def draw_sampled_spectrum(self, spectrum):
         self.plot_widget_4.clear()
 
-        num_repeats = 10  # Number of bandwidth repetitions
-        bandwidth = np.max(self.current_sample_frequency)  # Adjust this value to control the spacing between bands
+        # Spectral images repeated every fs, then the folded image inside the Nyquist band on top
+        LevelOfDetail.plot_curve(self.plot_widget_4, spectrum["frequencies"], spectrum["magnitude"], pen='b',
+                                 name='Sampled Spectrum')
+        LevelOfDetail.plot_curve(self.plot_widget_4, spectrum["folded_frequencies"], spectrum["folded_magnitude"],
+                                 pen='g', name='Folded Image')
+
+        frequencies = self.analysis.spectrum_frequencies
+        low, high = np.searchsorted(frequencies, SPECTRUM_X_RANGE)
+        LevelOfDetail.plot_curve(self.plot_widget_4, frequencies[low:high], self.analysis.magnitude_spectrum[low:high],
+                                 pen='r', name='Original Spectrum')
 
-        # Plot the repeated bands
-        for i in range(1, num_repeats + 1):
-            # Create a band centered around the original frequencies
-            band_shift = i * bandwidth
-            self.plot_widget_4.plot(frequencies + band_shift, np.abs(amplitude_fft) / n, pen='b',
-                                    name=f'Band {i}')
-            self.plot_widget_4.plot(frequencies - band_shift, np.abs(amplitude_fft) / n, pen='b',
-                                    name=f'Band -{i}')  # Include negative offsets for symmetry
+        aliases = spectrum["aliases"]
+        if len(aliases):
+            self.plot_widget_4.plot(aliases[:, 1], aliases[:, 2], pen=None, symbol='x', symbolBrush='y',
+                                    symbolPen='y', symbolSize=10, name='Aliased Components')
 
-        self.plot_widget_4.plot(frequencies, np.abs(amplitude_fft) / n, pen='r')
+    def update_difference_plot(self, difference_signal, plot_difference_mode, *_):
+        with Profiling.PROFILER.stage("render difference"):
+            self.draw_difference_plot(difference_signal, plot_difference_mode)
 
-    def update_difference_plot(self):
+    def draw_difference_plot(self, difference_signal, plot_difference_mode):
         # Clear the plot
         self.plot_widget_2.clear()
 
@@ -394,15 +612,15 @@ class MainWindow(QMainWindow):
         view_box_1 = self.plot_widget_1.getViewBox()  # Correct way to access the ViewBox
         x_range_1, y_range_1 = view_box_1.viewRange()  # Get the x and y ranges of plot_widget_1
 
-        if self.plot_difference_mode:
+        if plot_difference_mode:
             # Plot the difference between the original and reconstructed signals in plot_widget_2
-            difference_signal = self.noisy_signal - self.reconstructed_signal_noisy
-            self.plot_widget_2.plot(self.time, difference_signal, pen='m', name='Difference (Error)')
+            LevelOfDetail.plot_curve(self.plot_widget_2, self.time, difference_signal, pen='m',
+                                     name='Difference (Error)')
         else:
             # Plot both original and reconstructed noisy signals for comparison in plot_widget_2
-            self.plot_widget_2.plot(self.time, self.noisy_signal, pen='b', name='Original Signal')
-            self.plot_widget_2.plot(self.time, self.reconstructed_signal_noisy, pen='g',
-                                    name='Noisy Reconstructed Signal')
+            LevelOfDetail.plot_curve(self.plot_widget_2, self.time, self.noisy_signal, pen='b', name='Original Signal')
+            LevelOfDetail.plot_curve(self.plot_widget_2, self.time, self.reconstructed_signal_noisy, pen='g',
+                                     name='Noisy Reconstructed Signal')
 
         # Set the x and y ranges to match those of plot_widget_1 for plot_widget_2
         self.plot_widget_2.setXRange(*x_range_1, padding=0)
@@ -415,40 +633,175 @@ class MainWindow(QMainWindow):
     def update_reconstruction_method(self):
         """Update the reconstruction method based on the selected combo box item."""
         # Check if the signal data is loaded
-        if not hasattr(self, 'time') or not hasattr(self, 'amplitude'):
+        if self.pipeline.value("signal") is None:
             print("No signal data loaded. Please upload a signal first.")
             return  # Exit if there's no data to process
 
-        method = self.ui.reconstruction_method.currentText()  # Get selected text from combo box
-
-        t_interp = self.time  # High-resolution time array for reconstruction
-
-        if method == "Sinc Interpolation":
-            self.reconstructed_signal = self.sinc_interpolation(self.t_sampled, self.amplitude_sampled, t_interp)
-        elif method == "Zero-Order Hold":
-            self.reconstructed_signal = self.zero_order_hold_interpolation(self.t_sampled, self.amplitude_sampled,
-                                                                           t_interp)
-        elif method == "Lanczos Resampling":
-            self.reconstructed_signal = self.lanczos_resampling(self.t_sampled, self.amplitude_sampled, t_interp)
-
-        # Update the plot with the new reconstructed signal
-        self.plot_widget_1.clear()
-        self.plot_signal()
-        self.plot_widget_1.plot(
-            self.t_sampled,
-            self.amplitude_sampled,
-            pen=None,
-            symbol='o',
-            symbolBrush='r',
-            symbolSize=4,
-            name='Sampled Points'
-        )
-        self.plot_widget_3.clear()  # Clear reconstructed signal plot
-        self.plot_widget_3.plot(t_interp, self.reconstructed_signal, pen='g', name='Reconstructed Signal')
-        # Update the difference plot
-        self.plot_widget_2.clear()
-        difference_signal = self.amplitude - self.reconstructed_signal_noisy
-        self.plot_widget_2.plot(self.time, difference_signal, pen='m', name='Difference (Error)')
+        # The samples, the noisy signal and the spectrum do not depend on the method and are kept
+        if self.pipeline.set("method", self.ui.reconstruction_method.currentText()):
+            self.request_reconstruction()
+
+    def update_reconstruction_report(self, method):
+        """
+        Shows how the spectral method was evaluated next to the reconstructed signal title.
+        The FFT path treats the sampled block as periodic, so the wrap-around jump is reported with it.
+        The non-uniform method reports the bandwidth its sample times allow, with a warning when it is below
+        the signal's maximum frequency (common with Random sampling, whose widest gaps set the grid).
+        """
+        if method == "Non-uniform Sinc (Iterative)" and len(self.t_sampled) >= 2:
+            bandwidth = Reconstruction.nonuniform_bandwidth(self.t_sampled)
+            if bandwidth < self.max_signal_frequeny:
+                print(f"Warning: non-uniform reconstruction band-limited to {bandwidth:.1f} Hz, "
+                      f"below the maximum signal frequency {self.max_signal_frequeny:.1f} Hz")
+                self.ui.diff_plot_label.setText(f"Reconstructed Signal (band-limited to {bandwidth:.1f} Hz, "
+                                                f"below f_max {self.max_signal_frequeny:.1f} Hz)")
+            else:
+                self.ui.diff_plot_label.setText(f"Reconstructed Signal (band-limited to {bandwidth:.1f} Hz)")
+            return
+        if method != "Spectral (FFT) Sinc":
+            self.ui.diff_plot_label.setText("Reconstructed Signal")
+            return
+
+        if Reconstruction.spectral_resampling_ratio(self.t_sampled, self.time) is None:
+            self.ui.diff_plot_label.setText("Reconstructed Signal (direct sinc: samples off the signal grid)")
+        else:
+            mismatch = Reconstruction.periodic_edge_mismatch(self.amplitude_sampled)
+            self.ui.diff_plot_label.setText(
+                f"Reconstructed Signal (FFT path, periodic edges: wrap jump {mismatch * 100:.1f}%)")
+
+    def toggle_live_stream(self):
+        """Starts streaming from a growing CSV file or a local TCP port, or stops the running stream."""
+        if self.stream_source is not None:
+            self.stop_live_stream()
+            return
+
+        spec, accepted = QInputDialog.getText(self, "Live Stream",
+                                              "CSV file to follow, or tcp:<port> to listen on a local port:")
+        if not accepted or not spec.strip():
+            return
+        try:
+            self.stream_source = Streaming.open_source(spec.strip())
+        except (IOError, ValueError) as error:
+            self.show_error_message(f"Cannot open stream: {error}")
+            return
+
+        self.stream = Streaming.StreamingReconstructor()
+        for plot_widget in (self.plot_widget_1, self.plot_widget_2, self.plot_widget_3):
+            plot_widget.clear()
+            plot_widget.enableAutoRange()
+
+        # Persistent items are updated in place so the plots scroll without being rebuilt
+        self.stream_items = {
+            "signal": LevelOfDetail.plot_curve(self.plot_widget_1, [], [], pen='b', name='Live Signal'),
+            "sampled": LevelOfDetail.plot_markers(self.plot_widget_1, [], [], symbol='o', symbolBrush='r',
+                                                  symbolSize=2.5, name='Sampled Points'),
+            "difference": LevelOfDetail.plot_curve(self.plot_widget_2, [], [], pen='m', name='Difference (Error)'),
+            "reconstructed": LevelOfDetail.plot_curve(self.plot_widget_3, [], [], pen='g',
+                                                      name='Reconstructed Signal'),
+        }
+        self.ui.live_stream.setText("Stop Stream")
+        self.stream_timer.start(STREAM_UPDATE_MS)
+
+    def stop_live_stream(self):
+        self.stream_timer.stop()
+        self.stream_source.close()
+        self.stream_source = None
+        self.ui.live_stream.setText("Live Stream")
+        for stage in RENDER_STAGES:
+            self.pipeline.invalidate(stage)  # The stream drew over every plot
+        self.sample_and_reconstruct_signal()  # Go back to the loaded signal
+
+    def update_live_stream(self):
+        """Reads the newly arrived samples and reconstructs only the new block."""
+        try:
+            with Profiling.PROFILER.stage("stream read"):
+                time, amplitude = self.stream_source.read()
+        except (IOError, ValueError) as error:
+            self.stop_live_stream()
+            self.show_error_message(f"Stream stopped: {error}")
+            return
+
+        method = self.ui.reconstruction_method.currentText()
+        with Profiling.PROFILER.stage("stream reconstruction"):
+            self.stream.push(time, amplitude)
+            finalized = self.stream.process(method, self.ui.sampling_frequency.value())
+        if finalized == 0 and len(time) == 0:
+            return  # Nothing new to draw
+
+        with Profiling.PROFILER.stage("render stream"):
+            view = self.stream.view()
+            self.stream_items["signal"].setData(view["time"], view["amplitude"])
+            self.stream_items["sampled"].setData(view["t_sampled"], view["amplitude_sampled"])
+            self.stream_items["reconstructed"].setData(view["t_reconstructed"], view["reconstructed_signal"])
+            self.stream_items["difference"].setData(view["t_reconstructed"], view["difference"])
+
+    def compare_all_methods(self):
+        """Evaluates every reconstruction method at the current sampling settings in one shared pass."""
+        if not hasattr(self, 'time') or not hasattr(self, 'amplitude'):
+            return
+        sampling_mode = self.ui.sampling_mode.currentText()
+        with Profiling.PROFILER.stage("compare all"):
+            rows, shared_seconds = Worker.compare_methods(self.time, self.amplitude, self.analysis.time_step,
+                                                          self.current_sample_frequency, sampling_mode)
+        self.comparison_dialog.show_results(rows, shared_seconds, self.current_sample_frequency, sampling_mode)
+
+    def toggle_compact_mode(self, enabled):
+        """
+        Switches the pipeline between float64 and float32 amplitudes, reprocesses the loaded signal and
+        shows the precision impact on every method's reconstruction error.
+        """
+        self.compact_mode = enabled
+        if self.stream_source is not None or not hasattr(self, 'source_signal'):
+            return
+        # Keep the sampling frequency across the switch
+        self.process_signal_data(*self.source_signal, sampling_frequency=self.current_sample_frequency,
+                                 channel_names=self.signal.names)
+        if enabled:
+            self.compare_all_methods()  # Reports float32 against float64 errors
+
+    def export_signals(self):
+        """
+        Saves the clean, noisy, sampled and reconstructed signals, the error and the reconstruction parameters
+        to a .sig file (memory-mappable, loads back as the clean signal) or to CSV files.
+        """
+        if self.reconstructed_signal_noisy is None or self.stream_source is not None:
+            self.show_error_message("Reconstruct a signal before exporting it.")
+            return
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Signals", "",
+                                                   "Signal Files (*.sig);;CSV Files (*.csv)")
+        if not file_name:
+            return
+        if os.path.splitext(file_name)[1].lower() not in ('.sig', '.csv'):
+            file_name += '.sig'
+
+        # Finish any reconstruction still pending for the current controls, so that the arrays and the
+        # parameters below come from the same pipeline run
+        self.sample_and_reconstruct_signal()
+        sampling_frequency, sampling_mode = self.pipeline.value("sampling")
+        columns = {
+            "time": self.time,
+            "signal": self.amplitude,
+            "noisy": self.noisy_signal,
+            "reconstructed": self.reconstructed_signal,
+            "reconstructed_noisy": self.reconstructed_signal_noisy,
+            "error": self.pipeline.value("error"),  # As shown in the difference plot
+        }
+        samples = {"t_sampled": self.t_sampled, "sampled": self.amplitude_sampled}
+        metadata = {
+            "method": self.pipeline.value("method"),
+            "sampling_frequency": sampling_frequency,
+            "sampling_mode": sampling_mode,
+            "snr": self.pipeline.value("snr"),
+            "noise_power": self.noise_power,
+            "max_signal_frequency": float(self.max_signal_frequeny),
+            "compact": self.compact_mode,
+        }
+        try:
+            SignalIO.export_signals(file_name, columns, samples, metadata)
+        except (IOError, ValueError) as error:
+            self.show_error_message(f"Error exporting signals: {error}")
+            return
+        print(f"Exported signals to {file_name}")
 
     def toggle_plot_mode(self):
         self.toggle_plot_mode_button_name()
@@ -456,8 +809,9 @@ class MainWindow(QMainWindow):
         # Toggle the plot mode
         self.plot_difference_mode = not self.plot_difference_mode
 
-        # Update the plot based on the current mode
-        self.update_difference_plot()
+        # Only the difference plot depends on the mode
+        self.pipeline.set("plot mode", self.plot_difference_mode)
+        self.refresh()
 
     def toggle_plot_mode_button_name(self):
         if self.plot_difference_mode:
@@ -465,50 +819,21 @@ class MainWindow(QMainWindow):
         else:
             self.ui.toggle_plot_button.setText("Sampling Difference")
 
-    def sinc_interpolation(self, t_sampled, amplitude_sampled, t_interp):
+    def sinc_interpolation(self, t_sampled, amplitude_sampled, t_interp, kernel_width=None):
         """Reconstruct the signal using sinc interpolation at the specified times."""
-        if len(t_sampled) < 2:
-            print("Sampling interval too high for interpolation.")
-            return np.zeros_like(t_interp)  # Return an array of zeros to avoid errors in reconstruction plot
-        T = t_sampled[1] - t_sampled[0]  # Sampling period from sampled data
-        reconstructed_signal = np.zeros_like(t_interp)
-        for i in range(len(t_sampled)):
-            reconstructed_signal += amplitude_sampled[i] * np.sinc((t_interp - t_sampled[i]) / T)
-        return reconstructed_signal
+        return Reconstruction.sinc_interpolation(t_sampled, amplitude_sampled, t_interp, kernel_width=kernel_width)
 
     def lanczos_resampling(self, t_sampled, amplitude_sampled, t_interp, a=3):
         """Reconstruct the signal using Lanczos resampling at the specified times."""
-
-        def lanczos_kernel(x, a):
-            """Calculate the Lanczos kernel for a given distance and window parameter"""
-            if abs(x) < 1e-10:
-                return 1
-            elif abs(x) > a:
-                return 0
-            else:
-                return np.sinc(x) * np.sinc(x / a)
-
-        if len(t_sampled) < 2:  # Check if we have enough points for interpolation
-            print("Not enough points for Lanczos resampling.")
-            return np.zeros_like(t_interp)
-
-        reconstructed_signal = np.zeros_like(t_interp)
-
-        for i in range(len(t_interp)):
-            for j in range(len(t_sampled)):
-                distance = (t_interp[i] - t_sampled[j]) / (t_sampled[1] - t_sampled[0])
-                reconstructed_signal[i] += amplitude_sampled[j] * lanczos_kernel(distance, a)
-        return reconstructed_signal
+        return Reconstruction.lanczos_resampling(t_sampled, amplitude_sampled, t_interp, a=a)
 
     def zero_order_hold_interpolation(self, t_sampled, amplitude_sampled, t_interp):
         """Reconstruct the signal using zero-order hold (sample-and-hold) interpolation."""
-        reconstructed_signal = np.zeros_like(t_interp)
-        for i in range(len(t_sampled) - 1):
-            mask = (t_interp >= t_sampled[i]) & (t_interp < t_sampled[i + 1])  # Hold the value until the next sample
-            reconstructed_signal[mask] = amplitude_sampled[i]
-        # Hold the last sample value for the remainder of the signal
-        reconstructed_signal[t_interp >= t_sampled[-1]] = amplitude_sampled[-1]
-        return reconstructed_signal
+        return Reconstruction.zero_order_hold_interpolation(t_sampled, amplitude_sampled, t_interp)
+
+    def first_order_hold_interpolation(self, t_sampled, amplitude_sampled, t_interp):
+        """Reconstruct the signal using first-order hold (linear) interpolation."""
+        return Reconstruction.first_order_hold_interpolation(t_sampled, amplitude_sampled, t_interp)
 
 
 if __name__ == "__main__":
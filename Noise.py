@@ -0,0 +1,67 @@
+import os
+import threading
+
+import numpy as np
+
+# Seed of every noise realization; NYQUIST_NOISE_SEED=<int> overrides it at start-up.
+DEFAULT_NOISE_SEED = 0
+NOISE_SEED_ENV = "NYQUIST_NOISE_SEED"
+
+# Independent noise streams: the noise on the displayed signal and the noise on its reconstruction.
+NOISE_STREAMS = ("signal", "reconstruction")
+
+# Samples drawn per chunk, so float32 realizations never need a full-length float64 temporary.
+NOISE_CHUNK = 2 ** 16
+
+
+class NoiseSource:
+    """
+    Seeded white Gaussian noise. Each stream keeps one unit-variance realization for the current signal
+    length and type, drawn once from its own numpy Generator; every noise level is that realization scaled,
+    so changing the SNR costs one multiply and the same seed always gives the same noise.
+    float32 realizations are the float64 ones rounded, so both precisions see the same noise.
+    Streams may be used from any thread.
+    """
+
+    def __init__(self, seed=DEFAULT_NOISE_SEED):
+        self.seed = seed
+        self._units = {}  # stream -> (unit realization, its mean power)
+        self._lock = threading.Lock()
+
+    def _draw(self, stream, length, dtype):
+        generator = np.random.default_rng([self.seed, NOISE_STREAMS.index(stream)])
+        unit = np.empty(length, dtype=dtype)
+        for start in range(0, length, NOISE_CHUNK):
+            unit[start:start + NOISE_CHUNK] = generator.standard_normal(min(NOISE_CHUNK, length - start))
+        return unit, float(np.dot(unit, unit) / max(1, length))
+
+    def unit(self, stream, length, dtype=np.float64):
+        """The cached unit-variance realization of a stream and its measured mean power."""
+        with self._lock:
+            cached = self._units.get(stream)
+            if cached is None or len(cached[0]) != length or cached[0].dtype != dtype:
+                cached = self._units[stream] = self._draw(stream, length, np.dtype(dtype))
+            return cached
+
+    def scaled(self, stream, length, standard_deviation, dtype=np.float64, out=None):
+        """
+        Noise of the given standard deviation, written into `out` when given.
+        Returns the noise and its measured mean power.
+        """
+        unit, unit_power = self.unit(stream, length, dtype)
+        scale = np.dtype(dtype).type(standard_deviation)
+        return np.multiply(unit, scale, out=out), unit_power * float(scale) ** 2
+
+    def reseed(self, seed):
+        """Switches to another seed; the next request draws new realizations."""
+        with self._lock:
+            self.seed = seed
+            self._units.clear()
+
+    def clear(self):
+        with self._lock:
+            self._units.clear()
+
+
+# Shared by the GUI thread and the background reconstruction worker.
+NOISE = NoiseSource(int(os.environ.get(NOISE_SEED_ENV, DEFAULT_NOISE_SEED)))
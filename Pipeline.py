@@ -0,0 +1,128 @@
+from collections import Counter
+
+
+class _Stage:
+    __slots__ = ("name", "compute", "inputs", "background", "dirty", "value")
+
+    def __init__(self, name, compute, inputs, background):
+        self.name = name
+        self.compute = compute
+        self.inputs = inputs
+        self.background = background
+        self.dirty = compute is not None
+        self.value = None
+
+
+class StageGraph:
+    """
+    Processing stages with their upstream dependencies, a dirty flag and the memoized output of each.
+    Input stages hold values set from outside (the signal and the controls); every other stage is rerun
+    from the outputs of its inputs only when something upstream changed since its last run, so each
+    control only recomputes what depends on it.
+    Background stages are computed elsewhere and handed in with provide(); update() leaves them, and
+    everything downstream of them, dirty until then unless asked to compute them in place.
+    Stages must be added after their inputs, which keeps the insertion order topological.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._consumers = {}
+        self.runs = Counter()  # Number of times each stage was computed, here or in the background
+
+    def add_input(self, name, value=None):
+        self._stages[name] = _Stage(name, None, (), False)
+        self._stages[name].value = value
+        self._consumers[name] = []
+
+    def add_stage(self, name, compute, inputs, background=False):
+        """Adds a stage computed as compute(*input values)."""
+        for input_name in inputs:
+            self._consumers[input_name].append(name)
+        self._stages[name] = _Stage(name, compute, tuple(inputs), background)
+        self._consumers[name] = []
+
+    def value(self, name):
+        return self._stages[name].value
+
+    def is_dirty(self, name):
+        return self._stages[name].dirty
+
+    def set(self, name, value):
+        """
+        Sets an input and invalidates its downstream stages; returns False if the value did not change.
+        Scalars and tuples of scalars compare by value, anything else (arrays, objects) by identity.
+        """
+        stage = self._stages[name]
+        if stage.value is value or (_is_scalar(value) and _is_scalar(stage.value) and stage.value == value):
+            return False
+        stage.value = value
+        self._invalidate_consumers(name)
+        return True
+
+    def invalidate(self, name):
+        """Marks a stage and everything downstream of it for recomputation."""
+        stage = self._stages[name]
+        if stage.compute is not None:
+            stage.dirty = True
+        self._invalidate_consumers(name)
+
+    def _invalidate_consumers(self, name):
+        pending, seen = list(self._consumers[name]), set()
+        while pending:
+            stage = self._stages[pending.pop()]
+            if stage.name not in seen:
+                seen.add(stage.name)
+                stage.dirty = True
+                pending.extend(self._consumers[stage.name])
+
+    def provide(self, name, value):
+        """Stores the output of a stage computed elsewhere and invalidates its downstream stages."""
+        stage = self._stages[name]
+        stage.value = value
+        stage.dirty = False
+        self.runs[name] += 1
+        self._invalidate_consumers(name)
+
+    def waiting(self, names=None):
+        """Dirty background stages that the given stages (default: all) wait for."""
+        waiting, seen = [], set()
+        pending = list(names if names is not None else self._stages)
+        while pending:
+            stage = self._stages[pending.pop()]
+            if stage.name in seen or not stage.dirty:
+                continue
+            seen.add(stage.name)
+            if stage.background:
+                waiting.append(stage.name)
+            else:
+                pending.extend(stage.inputs)
+        return [name for name in self._stages if name in waiting]
+
+    def update(self, names=None, run_background=False):
+        """
+        Brings the given stages (default: all) up to date and returns the names of the stages that ran.
+        Stages waiting for a background stage stay dirty unless run_background is set.
+        """
+        ran = []
+        for name in names if names is not None else list(self._stages):
+            self._pull(name, run_background, ran)
+        return ran
+
+    def _pull(self, name, run_background, ran):
+        stage = self._stages[name]
+        if not stage.dirty:
+            return True
+        if stage.background and not run_background:
+            return False
+        ready = [self._pull(input_name, run_background, ran) for input_name in stage.inputs]
+        if not all(ready):
+            return False
+        stage.value = stage.compute(*(self._stages[input_name].value for input_name in stage.inputs))
+        stage.dirty = False
+        self.runs[name] += 1
+        ran.append(name)
+        return True
+
+
+def _is_scalar(value):
+    return isinstance(value, (bool, int, float, str, tuple, type(None)))
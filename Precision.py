@@ -0,0 +1,57 @@
+import numpy as np
+
+import Reconstruction
+
+# Amplitude type of the opt-in compact mode. Time and frequency axes stay float64: in float32 the spacing
+# of a long capture (e.g. 1 ms steps after 1000 s) would carry several percent of rounding jitter.
+COMPACT_DTYPE = np.float32
+
+
+def working_dtype(compact):
+    return COMPACT_DTYPE if compact else np.float64
+
+
+def as_working(amplitude, compact):
+    """Converts amplitudes to the working type; float64 arrays (including memory maps) are passed through."""
+    return np.asarray(amplitude, dtype=working_dtype(compact))
+
+
+class BufferPool:
+    """
+    Full-length output arrays reused across updates, reallocated only when the signal length or the
+    working type changes. Meant for the GUI thread, which draws from these arrays right after filling them.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, name, length, dtype):
+        buffer = self._buffers.get(name)
+        if buffer is None or len(buffer) != length or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(length, dtype=dtype)
+        return buffer
+
+    def clear(self):
+        self._buffers.clear()
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+
+def precision_impact(compact_signals, t_sampled, amplitude_sampled, t_interp, reference):
+    """
+    Precision impact of float32 reconstructions that were already computed (compact_signals, keyed by method):
+    reconstructs the same samples once more in float64 and reports, per method, the float64 MSE against the
+    reference and the largest difference between the float32 and float64 reconstructions.
+    """
+    full, _ = Reconstruction.reconstruct_all(t_sampled, amplitude_sampled.astype(np.float64), t_interp,
+                                             list(compact_signals))
+    reference = np.asarray(reference, dtype=np.float64)
+    report = {}
+    for method, compact in compact_signals.items():
+        report[method] = {
+            "float64_mse": Reconstruction.reconstruction_metrics(reference, full[method])["mse"],
+            "float32_deviation": float(np.max(np.abs(compact - full[method]))) if len(full[method]) else 0.0,
+        }
+    return report
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+
+# Number of most recent timings per stage kept for the rolling percentiles.
+PROFILE_WINDOW = 256
+
+# Percentiles shown in the stats overlay.
+PROFILE_PERCENTILES = (50, 90, 99)
+
+# Setting NYQUIST_PROFILE=1 enables the instrumentation at start-up; NYQUIST_PROFILE_LOG=<path> also
+# appends one JSON line per timed stage to that file.
+PROFILE_ENV = "NYQUIST_PROFILE"
+PROFILE_LOG_ENV = "NYQUIST_PROFILE_LOG"
+
+_DISABLED_STAGE = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """
+    Times the named stages of the sample/reconstruct/render pipeline and keeps the last PROFILE_WINDOW
+    durations of each, for rolling percentiles. Stages may run on any thread.
+    While disabled, stage() returns a shared no-op context, so instrumented code pays one attribute check.
+    """
+
+    def __init__(self, enabled=False, log_file=None, window=PROFILE_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self._timings = {}
+        self._lock = threading.Lock()
+        self._log = None
+        if log_file:
+            self.open_log(log_file)
+
+    def stage(self, name):
+        """Context manager timing one run of the named stage."""
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        with self._lock:
+            if name not in self._timings:
+                self._timings[name] = deque(maxlen=self.window)
+            self._timings[name].append(seconds)
+            if self._log is not None:
+                self._log.write(json.dumps({"time": time.time(), "thread": threading.current_thread().name,
+                                            "stage": name, "seconds": seconds}) + "\n")
+
+    @property
+    def logging(self):
+        return self._log is not None
+
+    def open_log(self, file_name):
+        """Appends every following timing to file_name as a JSON line (line-buffered)."""
+        with self._lock:
+            self._close_log()
+            self._log = open(file_name, "a", buffering=1)
+        self.enabled = True
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def close(self):
+        with self._lock:
+            self._close_log()
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+
+    def statistics(self, percentiles=PROFILE_PERCENTILES):
+        """Returns {stage: (count, [percentile seconds...])} over each stage's rolling window, in first-seen order."""
+        with self._lock:
+            timings = {name: np.array(values) for name, values in self._timings.items()}
+        return {name: (len(values), np.percentile(values, percentiles).tolist())
+                for name, values in timings.items() if len(values)}
+
+    def report(self, percentiles=PROFILE_PERCENTILES):
+        """Formats statistics() as a fixed-width text table in milliseconds."""
+        header = f"{'stage':<22}{'n':>5}" + "".join(f"{f'p{p}':>9}" for p in percentiles)
+        lines = [header]
+        for name, (count, values) in self.statistics(percentiles).items():
+            lines.append(f"{name:<22}{count:>5}" + "".join(f"{value * 1e3:9.2f}" for value in values))
+        if len(lines) == 1:
+            lines.append("no timings yet")
+        return "\n".join(lines)
+
+
+# Shared by the GUI thread and the background reconstruction worker.
+PROFILER = Profiler(enabled=os.environ.get(PROFILE_ENV, "") not in ("", "0"),
+                    log_file=os.environ.get(PROFILE_LOG_ENV))
@@ -0,0 +1,606 @@
+import time
+from fractions import Fraction
+
+import numpy as np
+from scipy.fft import next_fast_len
+from scipy.sparse import csr_matrix
+
+# Upper bound on the number of kernel evaluations held in memory at once.
+# 2**20 float64 values is 8 MB per temporary, regardless of the signal length.
+MAX_BLOCK_ELEMENTS = 2 ** 20
+
+# Largest denominator of the rational ratio between the sample period and the output step of the spectral sinc.
+SPECTRAL_MAX_DENOMINATOR = 10000
+
+
+def _block_rows(columns, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """Number of output points that can be processed per block for a given row width."""
+    return max(1, max_block_elements // max(1, columns))
+
+
+def _output_dtype(amplitude_sampled):
+    """
+    Floating type of a reconstruction: float32 amplitudes give float32 output (compact mode), anything
+    else float64. Kernels are still evaluated in float64, one bounded block at a time.
+    """
+    return np.result_type(amplitude_sampled, np.float32)
+
+
+def _zeros(t_interp, amplitude_sampled):
+    """Empty reconstruction: one row per output time, with the channel axis of the samples if they have one."""
+    return np.zeros((len(t_interp),) + np.shape(amplitude_sampled)[1:], dtype=_output_dtype(amplitude_sampled))
+
+
+def _per_row(values, amplitude_sampled):
+    """Reshapes one value per output time (or per sample) to broadcast over the channel axis of the samples."""
+    return values.reshape(values.shape + (1,) * (np.ndim(amplitude_sampled) - 1))
+
+
+def is_uniform(t_sampled, tolerance=1e-9):
+    """Checks whether the sample times lie on the grid t_sampled[0] + k * T within tolerance * T."""
+    if len(t_sampled) < 2:
+        return False
+    T = t_sampled[1] - t_sampled[0]
+    grid = t_sampled[0] + T * np.arange(len(t_sampled))
+    return bool(np.max(np.abs(t_sampled - grid)) <= tolerance * abs(T))
+
+
+def sample_period(t_sampled):
+    """
+    Sampling period of the kernels: the step of a uniform grid, or the mean step of jittered and random
+    sample times, which have no single step.
+    """
+    if is_uniform(t_sampled):
+        return t_sampled[1] - t_sampled[0]
+    return (t_sampled[-1] - t_sampled[0]) / (len(t_sampled) - 1)
+
+
+def _kernel_support(t_sampled, t_interp, half_width):
+    """
+    Band of samples within half_width sample periods of each output time: returns (first, stop, width), where
+    row i spans the sample indices first[i] <= j < stop[i] and width is the widest row. On a uniform grid these
+    are the 2 * half_width nearest samples; non-uniform times can crowd more samples into the support.
+    Indices may run past the ends of t_sampled.
+    """
+    if is_uniform(t_sampled):
+        first = np.searchsorted(t_sampled, t_interp) - half_width
+        return first, first + 2 * half_width, 2 * half_width
+    T = sample_period(t_sampled)
+    first = np.searchsorted(t_sampled, t_interp - half_width * T)
+    stop = np.searchsorted(t_sampled, t_interp + half_width * T, side='right')
+    return first, stop, max(1, int(np.max(stop - first, initial=0)))
+
+
+def _support_indices(first, stop, width, count):
+    """(Clipped) sample indices of rows of the kernel support, and a mask marking the ones really in it."""
+    indices = first[:, None] + np.arange(width)[None, :]
+    valid = (indices >= 0) & (indices < count) & (indices < stop[:, None])
+    return np.clip(indices, 0, count - 1), valid
+
+
+def _banded_weights(t_sampled, t_interp, half_width, kernel, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Yields (start, indices, weights) blocks holding kernel((t - t_sampled[j]) / T) for the samples within
+    half_width sample periods of each output time t (see _kernel_support); missing neighbours get zero weight.
+    """
+    T = sample_period(t_sampled)
+    first, stop, width = _kernel_support(t_sampled, t_interp, half_width)
+    rows = _block_rows(width, max_block_elements)
+
+    for start in range(0, len(t_interp), rows):
+        t_block = t_interp[start:start + rows]
+        indices, valid = _support_indices(first[start:start + rows], stop[start:start + rows], width,
+                                          len(t_sampled))
+        distance = (t_block[:, None] - t_sampled[indices]) / T
+        yield start, indices, kernel(distance) * valid
+
+
+def _banded_sum(t_sampled, amplitude_sampled, t_interp, half_width, kernel, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Evaluates sum_j amplitude_sampled[j] * kernel((t - t_sampled[j]) / T) using only the samples within
+    half_width sample periods of each output time t. The weights of each block are shared by all channels.
+    """
+    reconstructed_signal = _zeros(t_interp, amplitude_sampled)
+    channels = int(np.prod(np.shape(amplitude_sampled)[1:]))
+    for start, indices, weights in _banded_weights(t_sampled, t_interp, half_width, kernel,
+                                                   max(1, max_block_elements // channels)):
+        reconstructed_signal[start:start + len(indices)] = np.einsum('ij,ij...->i...', weights,
+                                                                     amplitude_sampled[indices])
+    return reconstructed_signal
+
+
+def sinc_interpolation(t_sampled, amplitude_sampled, t_interp, kernel_width=None, window="rect",
+                       max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Reconstructs the signal using sinc interpolation at the specified times.
+    Parameters:
+        - kernel_width: None for the exact sum over every sample, or the width K of the truncated kernel in
+          sample periods: each output point sums the samples within K / 2 periods (the K nearest on a uniform grid).
+        - window: Taper applied to the truncated kernel, "rect" (plain truncation) or "hann".
+        - max_block_elements: Maximum number of kernel values evaluated per block.
+    The exact path matches the sample-by-sample summation to floating-point rounding
+    (relative error below 1e-9; uniform grids use a cheaper closed form for the kernel).
+    The truncated path drops the sinc tails beyond K / 2 sample periods, which bounds the
+    error by roughly max|x| / (pi * K / 2) per side.
+    """
+    if len(t_sampled) < 2:
+        print("Sampling interval too high for interpolation.")
+        return _zeros(t_interp, amplitude_sampled)  # Return an array of zeros to avoid errors in reconstruction plot
+
+    if kernel_width is not None:
+        half_width = max(1, int(kernel_width) // 2)
+        if window == "hann":
+            kernel = hann_sinc_kernel(half_width)
+        elif window == "rect":
+            kernel = np.sinc
+        else:
+            raise ValueError(f"Unknown sinc window '{window}'.")
+        return _banded_sum(t_sampled, amplitude_sampled, t_interp, half_width, kernel, max_block_elements)
+
+    T = sample_period(t_sampled)  # Sampling period from sampled data
+    reconstructed_signal = _zeros(t_interp, amplitude_sampled)
+    rows = _block_rows(len(t_sampled), max_block_elements)
+
+    if not is_uniform(t_sampled):
+        for start in range(0, len(t_interp), rows):
+            t_block = t_interp[start:start + rows]
+            kernel_block = np.sinc((t_block[:, None] - t_sampled[None, :]) / T)
+            reconstructed_signal[start:start + rows] = kernel_block @ amplitude_sampled
+        return reconstructed_signal
+
+    # On a uniform grid sin(pi * (u - j)) = (-1)^j * sin(pi * u), so the sine can be taken out of the sum
+    # and each kernel value costs a single division instead of a full np.sinc evaluation.
+    u = (t_interp - t_sampled[0]) / T
+    sample_index = np.arange(len(t_sampled))
+    sign = _per_row(np.where(sample_index % 2 == 0, 1.0, -1.0), amplitude_sampled)
+    alternating_amplitude = amplitude_sampled * sign
+
+    for start in range(0, len(t_interp), rows):
+        u_block = u[start:start + rows]
+        distance = u_block[:, None] - sample_index[None, :]
+        on_sample = np.abs(distance) < 1e-9
+        distance[on_sample] = 1.0
+        row_sine = _per_row(np.sin(np.pi * u_block) / np.pi, amplitude_sampled)
+        block = row_sine * ((1.0 / distance) @ alternating_amplitude)
+
+        # Output times that coincide with a sample take that sample's value exactly
+        hit_rows, hit_columns = np.nonzero(on_sample)
+        block[hit_rows] = amplitude_sampled[hit_columns]
+        reconstructed_signal[start:start + rows] = block
+    return reconstructed_signal
+
+
+def hann_sinc_kernel(half_width):
+    """Sinc kernel tapered to zero at +-half_width sample periods by a Hann window."""
+    def kernel(x):
+        return np.sinc(x) * np.where(np.abs(x) < half_width, 0.5 * (1 + np.cos(np.pi * x / half_width)), 0)
+    return kernel
+
+
+def lanczos_kernel(x, a=3):
+    """Calculates the Lanczos kernel for an array of distances (in sample periods) and window parameter a."""
+    return np.where(np.abs(x) < a, np.sinc(x) * np.sinc(x / a), 0.0)
+
+
+def lanczos_resampling(t_sampled, amplitude_sampled, t_interp, a=3, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Reconstructs the signal using Lanczos resampling at the specified times.
+    The kernel is zero beyond a sample periods, so only the samples within that support (the 2a neighbours of
+    each output point on a uniform grid) are gathered and evaluated, giving O(N * a) work instead of O(N * M).
+    """
+    if len(t_sampled) < 2:  # Check if we have enough points for interpolation
+        print("Not enough points for Lanczos resampling.")
+        return _zeros(t_interp, amplitude_sampled)
+
+    return _banded_sum(t_sampled, amplitude_sampled, t_interp, a, lambda x: lanczos_kernel(x, a), max_block_elements)
+
+
+def lanczos_matrix(t_sampled, t_interp, a=3, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Builds the sparse (len(t_interp) x len(t_sampled)) Lanczos interpolation matrix.
+    It can be reused for any amplitudes sampled at the same times: matrix @ amplitude_sampled.
+    """
+    return _banded_matrix(t_sampled, t_interp, a, lambda x: lanczos_kernel(x, a), max_block_elements)
+
+
+def _banded_matrix(t_sampled, t_interp, half_width, kernel, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """Sparse (len(t_interp) x len(t_sampled)) matrix of the banded kernel weights of _banded_weights."""
+    blocks = list(_banded_weights(t_sampled, t_interp, half_width, kernel, max_block_elements))
+    rows = np.concatenate([np.repeat(np.arange(start, start + len(indices)), indices.shape[1])
+                           for start, indices, _ in blocks])
+    columns = np.concatenate([indices.ravel() for _, indices, _ in blocks])
+    values = np.concatenate([weights.ravel() for _, _, weights in blocks])
+    return csr_matrix((values, (rows, columns)), shape=(len(t_interp), len(t_sampled)))
+
+
+def _held_sample_indices(t_sampled, t_interp):
+    """Index of the latest sample at or before each output time (-1 before the first sample)."""
+    return np.searchsorted(t_sampled, t_interp, side='right') - 1
+
+
+def zero_order_hold_interpolation(t_sampled, amplitude_sampled, t_interp):
+    """
+    Reconstructs the signal using zero-order hold (sample-and-hold) interpolation.
+    Each output time takes the value of the latest sample at or before it; the last sample is
+    held to the end and times before the first sample are zero.
+    """
+    if len(t_sampled) == 0:
+        return _zeros(t_interp, amplitude_sampled)
+    return _zero_order_hold(amplitude_sampled, _held_sample_indices(t_sampled, t_interp))
+
+
+def _zero_order_hold(amplitude_sampled, held_indices):
+    reconstructed_signal = amplitude_sampled[np.maximum(held_indices, 0)]
+    reconstructed_signal[held_indices < 0] = 0
+    return reconstructed_signal
+
+
+def first_order_hold_interpolation(t_sampled, amplitude_sampled, t_interp):
+    """
+    Reconstructs the signal by joining consecutive samples with straight lines.
+    Follows the same conventions as the zero-order hold: the last sample is held to the end
+    and times before the first sample are zero.
+    """
+    if len(t_sampled) < 2:
+        return zero_order_hold_interpolation(t_sampled, amplitude_sampled, t_interp)
+    return _first_order_hold(t_sampled, amplitude_sampled, t_interp, _held_sample_indices(t_sampled, t_interp))
+
+
+def _first_order_hold(t_sampled, amplitude_sampled, t_interp, held_indices):
+    indices = np.clip(held_indices, 0, len(t_sampled) - 2)
+    t_start, t_end = t_sampled[indices], t_sampled[indices + 1]
+    fraction = np.clip((t_interp - t_start) / (t_end - t_start), 0, 1).astype(_output_dtype(amplitude_sampled),
+                                                                               copy=False)
+    fraction = _per_row(fraction, amplitude_sampled)
+    reconstructed_signal = amplitude_sampled[indices] + fraction * (amplitude_sampled[indices + 1] -
+                                                                    amplitude_sampled[indices])
+    reconstructed_signal[t_interp < t_sampled[0]] = 0
+    return reconstructed_signal
+
+
+def spectral_resampling_ratio(t_sampled, t_interp, tolerance=1e-9):
+    """
+    Returns (L, step) when both time axes are uniform and t_interp lies on every step-th point of the grid
+    t_sampled[0] + n * T / L, i.e. when T / dt is the rational L / step (integer up-sampling has step 1, the
+    polyphase sampling mode gives L / step = down / up); otherwise None (the FFT path does not apply).
+    """
+    if not is_uniform(t_sampled, tolerance) or not is_uniform(t_interp, tolerance):
+        return None
+    T = (t_sampled[-1] - t_sampled[0]) / (len(t_sampled) - 1)
+    dt = (t_interp[-1] - t_interp[0]) / (len(t_interp) - 1)
+    ratio = Fraction(float(T / dt)).limit_denominator(SPECTRAL_MAX_DENOMINATOR)
+    factor, step = ratio.numerator, ratio.denominator
+    if factor == 0:
+        return None
+    # Both axes are uniform, so matching the grid at both ends of t_interp matches it everywhere
+    fine_step = T / factor
+    start = (t_interp[0] - t_sampled[0]) / fine_step
+    end = start + (len(t_interp) - 1) * step
+    if abs(start - round(start)) > 1e-6 or abs(t_sampled[0] + round(end) * fine_step - t_interp[-1]) > 1e-6 * dt:
+        return None
+    return factor, step
+
+
+def periodic_edge_mismatch(amplitude_sampled):
+    """
+    Relative size of the jump the FFT path sees where the sampled block wraps around on itself.
+    Values near 0 mean the periodic and the exact (aperiodic) sinc reconstructions agree at the edges.
+    """
+    span = np.ptp(amplitude_sampled) if len(amplitude_sampled) else 0
+    if span == 0:
+        return 0.0
+    return float(abs(amplitude_sampled[-1] - amplitude_sampled[0]) / span)
+
+
+def spectral_sinc_interpolation(t_sampled, amplitude_sampled, t_interp, max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Reconstructs the signal by zero-padding the spectrum of the samples (band-limited interpolation).
+    Uniform samples whose period T is a rational multiple L / step of the t_interp step take the FFT path,
+    which treats the sampled block as one period of a periodic signal; anything else falls back to direct
+    sinc summation. The output times lie on the up-sampled grid T / L. When that grid is larger than both the
+    output and a memory block (large L, as with the polyphase sampling mode), it is never built: the single
+    spectrum is evaluated at the output times only, one chirp-z transform per bounded block of outputs.
+    """
+    if len(t_sampled) < 2:
+        print("Sampling interval too high for interpolation.")
+        return _zeros(t_interp, amplitude_sampled)
+
+    ratio = spectral_resampling_ratio(t_sampled, t_interp)
+    if ratio is None:
+        return sinc_interpolation(t_sampled, amplitude_sampled, t_interp)
+    factor, step = ratio
+
+    # Index of every output time on the up-sampled grid; times before/after the periodic block wrap around
+    count = len(t_sampled)
+    fine_step = (t_sampled[-1] - t_sampled[0]) / (count - 1) / factor
+    start = int(round((t_interp[0] - t_sampled[0]) / fine_step))
+    fine_index = (start + step * np.arange(len(t_interp))) % (count * factor)
+
+    spectrum = np.fft.rfft(amplitude_sampled, axis=0)
+    channels = int(np.prod(np.shape(amplitude_sampled)[1:], dtype=int))
+    if count * factor <= max(max_block_elements // channels, len(t_interp)):
+        if count % 2 == 0:
+            spectrum[-1] *= 0.5  # Split the Nyquist bin between its positive and negative images
+        return (np.fft.irfft(spectrum, n=count * factor, axis=0) * factor)[fine_index]
+
+    # The up-sampled grid is too large to build: evaluate its trigonometric polynomial at the angles
+    # 2 pi k / P of the output indices k = start + step * n only, P = count * factor. Those angles step
+    # evenly, so each block of outputs is one chirp-z transform of the spectrum (Bluestein's identity
+    # f * n = (f^2 + n^2 - (n - f)^2) / 2 turns it into a convolution), and every block shares the chirps
+    if count % 2 == 0:
+        spectrum[-1] *= 0.5
+    period = count * factor
+    bins = len(spectrum)
+    # Blocks of a few spectrum lengths keep the transforms short; the memory block bounds them too
+    rows = min(len(t_interp), max(bins, min(8 * bins, _block_rows(channels, max_block_elements))))
+    size = next_fast_len(rows + bins - 1)
+
+    def chirp(x):
+        # exp(i pi step x^2 / P), with the angle reduced exactly in integers before scaling
+        return np.exp(1j * np.pi * ((step * x * x) % (2 * period)) / period)
+
+    frequencies = np.arange(bins)
+    lags = np.arange(-(bins - 1), rows)
+    convolution = np.zeros(size, dtype=complex)
+    convolution[lags % size] = np.conj(chirp(lags))
+    convolution = _per_row(np.fft.fft(convolution), spectrum)
+    spectrum = spectrum * _per_row(chirp(frequencies), spectrum)
+    output_chirp = _per_row(chirp(np.arange(rows)), spectrum)
+
+    reconstructed_signal = _zeros(t_interp, amplitude_sampled)
+    for first in range(0, len(t_interp), rows):
+        offset = (start + step * first) % period
+        shift = np.exp(2j * np.pi * (frequencies * offset % period) / period)
+        sums = np.fft.ifft(np.fft.fft(_per_row(shift, spectrum) * spectrum, n=size, axis=0) * convolution,
+                           axis=0)[:rows] * output_chirp
+        # Real signal: the negative frequencies are the conjugates, and the DC bin is counted once
+        values = (2 * sums.real - spectrum[0].real) / count
+        reconstructed_signal[first:first + rows] = values[:len(t_interp) - first]
+    return reconstructed_signal
+
+
+# Band-limited reconstruction from non-uniform samples: half width (in grid steps) of the windowed sinc that
+# links the uniform grid to the sample times, Tikhonov damping of the fit, and the conjugate gradient limits.
+NONUNIFORM_HALF_WIDTH = 8
+NONUNIFORM_DAMPING = 1e-6
+NONUNIFORM_ITERATIONS = 200
+NONUNIFORM_TOLERANCE = 1e-8
+
+# Gaps wider than the grid spacing leave grid values unconstrained, so the grid of non-uniform samples is
+# coarsened until only this percentile of the gaps is wider; this trades bandwidth for stability.
+NONUNIFORM_GAP_PERCENTILE = 95
+
+
+def conjugate_gradient(apply, rhs, iterations=NONUNIFORM_ITERATIONS, tolerance=NONUNIFORM_TOLERANCE):
+    """
+    Solves apply(x) = rhs for a symmetric positive definite operator by conjugate gradients.
+    A 2-D rhs holds one system per column; all columns are iterated together, each with its own step sizes,
+    until every residual is below tolerance times its right-hand side. Returns (x, iterations run).
+    """
+    x = np.zeros_like(rhs)
+    residual = rhs.copy()
+    direction = residual.copy()
+    residual_norm = np.sum(residual * residual, axis=0)
+    target = tolerance ** 2 * np.maximum(residual_norm, np.finfo(float).tiny)
+    for iteration in range(iterations):
+        if np.all(residual_norm <= target):
+            return x, iteration
+        product = apply(direction)
+        step = residual_norm / np.maximum(np.sum(direction * product, axis=0), np.finfo(float).tiny)
+        x += step * direction
+        residual -= step * product
+        new_residual_norm = np.sum(residual * residual, axis=0)
+        direction = residual + (new_residual_norm / np.maximum(residual_norm, np.finfo(float).tiny)) * direction
+        residual_norm = new_residual_norm
+    return x, iterations
+
+
+def nonuniform_grid_spacing(t_sampled):
+    """
+    Spacing T of the uniform grid behind nonuniform_sinc_interpolation; its reconstructions are band-limited
+    to 1 / (2 T). T is the mean sample spacing, widened to the NONUNIFORM_GAP_PERCENTILE gap when the
+    samples are not uniform: random sampling needs a denser average rate than jittered sampling for the
+    same bandwidth.
+    """
+    T = sample_period(t_sampled)
+    if not is_uniform(t_sampled):
+        T = max(T, np.percentile(np.diff(t_sampled), NONUNIFORM_GAP_PERCENTILE))
+    return T
+
+
+def nonuniform_bandwidth(t_sampled):
+    """
+    Highest frequency (Hz) nonuniform_sinc_interpolation can represent with these sample times. Content above
+    it is lost, so callers that know the signal's maximum frequency should warn when it is lower.
+    """
+    return 1 / (2 * nonuniform_grid_spacing(t_sampled))
+
+
+def nonuniform_sinc_interpolation(t_sampled, amplitude_sampled, t_interp, half_width=NONUNIFORM_HALF_WIDTH,
+                                  damping=NONUNIFORM_DAMPING, iterations=NONUNIFORM_ITERATIONS,
+                                  max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Band-limited reconstruction from arbitrary (jittered, random or uniform) sample times.
+    The signal is modelled as s(t) = sum_k g_k h((t - tau_k) / T): windowed-sinc interpolation of values g_k on
+    a uniform grid tau_k with the spacing T of nonuniform_grid_spacing, so it is band-limited to 1 / (2 T).
+    g is the damped least-squares fit to the samples, found by conjugate gradients on
+    (A^T A + damping I) g = A^T y, where A = h((t_j - tau_k) / T) is sparse with 2 * half_width entries per row.
+    Each iteration costs O(M * half_width) and evaluating s at t_interp O(N * half_width), so no dense
+    system is ever built. On a uniform grid A is the identity and this is a Hann-windowed sinc interpolation.
+    """
+    if len(t_sampled) < 2:
+        print("Sampling interval too high for interpolation.")
+        return _zeros(t_interp, amplitude_sampled)
+
+    T = nonuniform_grid_spacing(t_sampled)
+    t_grid = t_sampled[0] + T * np.arange(int(np.ceil((t_sampled[-1] - t_sampled[0]) / T - 1e-9)) + 1)
+    kernel = hann_sinc_kernel(half_width)
+    matrix = _banded_matrix(t_grid, t_sampled, half_width, kernel, max_block_elements)
+    matrix_transpose = matrix.T.tocsr()
+
+    grid_values, _ = conjugate_gradient(lambda values: matrix_transpose @ (matrix @ values) + damping * values,
+                                        matrix_transpose @ np.asarray(amplitude_sampled, dtype=np.float64),
+                                        iterations)
+    return _banded_sum(t_grid, grid_values.astype(_output_dtype(amplitude_sampled), copy=False), t_interp,
+                       half_width, kernel, max_block_elements)
+
+
+# Every method takes the samples of one channel, (M,), or of several channels sampled at the same instants,
+# (M, channels), and reconstructs all channels in one batched pass: kernels, indices and weights are computed
+# once per block and applied to every channel with a single matrix product.
+RECONSTRUCTION_METHODS = {
+    "Sinc Interpolation": sinc_interpolation,
+    "Spectral (FFT) Sinc": spectral_sinc_interpolation,
+    "Zero-Order Hold": zero_order_hold_interpolation,
+    "First-Order Hold": first_order_hold_interpolation,
+    "Lanczos Resampling": lanczos_resampling,
+    "Non-uniform Sinc (Iterative)": nonuniform_sinc_interpolation,
+}
+
+
+def _shared_kernel_pass(t_sampled, amplitude_sampled, t_interp, held_indices, seconds, a=3,
+                        max_block_elements=MAX_BLOCK_ELEMENTS):
+    """
+    Computes the exact sinc and the Lanczos reconstructions in one pass over the blocks of the distance
+    grid x = (t - t_sampled[j]) / T: the sinc sums each full block row, and the Lanczos kernel is evaluated on
+    the 2a entries of the same row around the held sample. Returns (sinc signal, Lanczos signal) and adds
+    the time spent on the shared work, the sinc and the Lanczos parts to seconds. Like the individual methods,
+    it takes (M,) or (M, channels) samples and shares the kernel weights of each block between the channels.
+    On a uniform grid both kernels also share sin(pi * u) of the row: sin(pi * x) = (-1)^j * sin(pi * u), and
+    sin(pi * x / a) expands into row and column terms, so the Lanczos weights need no per-entry sine at all.
+    """
+    clock = time.perf_counter
+    T = sample_period(t_sampled)
+    sinc_signal, lanczos_signal = _zeros(t_interp, amplitude_sampled), _zeros(t_interp, amplitude_sampled)
+    rows = _block_rows(len(t_sampled), max_block_elements)
+    offsets = np.arange(-a + 1, a + 1)
+    uniform = is_uniform(t_sampled)
+    if not uniform:
+        first, stop, width = _kernel_support(t_sampled, t_interp, a)
+    if uniform:
+        u = (t_interp - t_sampled[0]) / T
+        sample_index = np.arange(len(t_sampled))
+        sign = np.where(sample_index % 2 == 0, 1.0, -1.0)
+        alternating_amplitude = amplitude_sampled * _per_row(sign, amplitude_sampled)
+        # Column terms of sin(pi * (u - j) / a) = sin(pi * u / a) cos(pi * j / a) - cos(pi * u / a) sin(pi * j / a)
+        column_cos, column_sin = np.cos(np.pi * sample_index / a), np.sin(np.pi * sample_index / a)
+
+    for start in range(0, len(t_interp), rows):
+        begin = clock()
+        t_block = t_interp[start:start + rows]
+        if uniform:
+            indices = held_indices[start:start + rows, None] + offsets[None, :]
+            valid = (indices >= 0) & (indices < len(t_sampled))
+            indices = np.clip(indices, 0, len(t_sampled) - 1)
+        else:  # Non-uniform times can crowd more than 2a samples into the Lanczos support
+            indices, valid = _support_indices(first[start:start + rows], stop[start:start + rows], width,
+                                              len(t_sampled))
+        if uniform:
+            u_block = u[start:start + rows]
+            distance = u_block[:, None] - sample_index[None, :]
+            row_sine = np.sin(np.pi * u_block)
+            near = np.take_along_axis(distance, indices, axis=1)
+        else:
+            distance = (t_block[:, None] - t_sampled[None, :]) / T
+            near = np.take_along_axis(distance, indices, axis=1)
+        split = clock()
+        seconds["Shared"] += split - begin
+
+        # Lanczos: the 2a samples around the held sample of each output time
+        if uniform:
+            window_sine = (np.sin(np.pi * u_block / a)[:, None] * column_cos[indices]
+                           - np.cos(np.pi * u_block / a)[:, None] * column_sin[indices])
+            on_sample = np.abs(near) < 1e-9
+            near_safe = np.where(on_sample, 1.0, near)
+            weights = a * sign[indices] * row_sine[:, None] * window_sine / (np.pi * near_safe) ** 2
+            weights = np.where(on_sample, 1.0, np.where(np.abs(near) < a, weights, 0.0)) * valid
+        else:
+            weights = lanczos_kernel(near, a) * valid
+        lanczos_signal[start:start + len(t_block)] = np.einsum('ij,ij...->i...', weights, amplitude_sampled[indices])
+        begin = clock()
+        seconds["Lanczos Resampling"] += begin - split
+
+        if uniform:
+            # Same closed form as sinc_interpolation on a uniform grid
+            on_sample = np.abs(distance) < 1e-9
+            distance[on_sample] = 1.0
+            block = _per_row(row_sine / np.pi, amplitude_sampled) * ((1.0 / distance) @ alternating_amplitude)
+            hit_rows, hit_columns = np.nonzero(on_sample)
+            block[hit_rows] = amplitude_sampled[hit_columns]
+            sinc_signal[start:start + len(t_block)] = block
+        else:
+            sinc_signal[start:start + len(t_block)] = np.sinc(distance) @ amplitude_sampled
+        seconds["Sinc Interpolation"] += clock() - begin
+    return sinc_signal, lanczos_signal
+
+
+def reconstruct_all(t_sampled, amplitude_sampled, t_interp, methods=None):
+    """
+    Reconstructs the signal with several registered methods (all by default) in one pass, sharing the
+    intermediate data between them: the held-sample indices of both holds, the sinc/Lanczos distance
+    grid, and the exact sinc result that the spectral method falls back to off the FFT grid.
+    Returns (signals, seconds): dicts keyed by method, plus seconds["Shared"] for the work they share.
+    """
+    methods = list(RECONSTRUCTION_METHODS) if methods is None else list(methods)
+    signals, seconds = {}, {"Shared": 0.0}
+    clock = time.perf_counter
+    if len(t_sampled) < 2:  # Too few samples for any shared work, let each method handle it
+        for method in methods:
+            start = clock()
+            signals[method] = reconstruct(method, t_sampled, amplitude_sampled, t_interp)
+            seconds[method] = clock() - start
+        return signals, seconds
+
+    start = clock()
+    held_indices = _held_sample_indices(t_sampled, t_interp)
+    seconds["Shared"] += clock() - start
+
+    if "Sinc Interpolation" in methods or "Spectral (FFT) Sinc" in methods:
+        start = clock()
+        ratio = spectral_resampling_ratio(t_sampled, t_interp)
+        seconds["Shared"] += clock() - start
+        if "Sinc Interpolation" in methods or ratio is None:
+            # The exact sinc dominates the cost; the Lanczos kernel rides along on its distance grid
+            seconds["Sinc Interpolation"] = seconds["Lanczos Resampling"] = 0.0
+            signals["Sinc Interpolation"], signals["Lanczos Resampling"] = _shared_kernel_pass(
+                t_sampled, amplitude_sampled, t_interp, held_indices, seconds)
+        if "Spectral (FFT) Sinc" in methods:
+            start = clock()
+            signals["Spectral (FFT) Sinc"] = (spectral_sinc_interpolation(t_sampled, amplitude_sampled, t_interp)
+                                              if ratio is not None else signals["Sinc Interpolation"].copy())
+            seconds["Spectral (FFT) Sinc"] = clock() - start
+            if ratio is None:  # The fallback costs what the exact sinc it reuses cost
+                seconds["Spectral (FFT) Sinc"] += seconds["Sinc Interpolation"]
+
+    for method in methods:
+        start = clock()
+        if method == "Zero-Order Hold":
+            signals[method] = _zero_order_hold(amplitude_sampled, held_indices)
+        elif method == "First-Order Hold":
+            signals[method] = _first_order_hold(t_sampled, amplitude_sampled, t_interp, held_indices)
+        elif method not in signals:
+            signals[method] = reconstruct(method, t_sampled, amplitude_sampled, t_interp)
+        seconds.setdefault(method, clock() - start)
+
+    seconds = {name: seconds[name] for name in ["Shared"] + methods}
+    return {method: signals[method] for method in methods}, seconds
+
+
+def reconstruction_metrics(reference, reconstructed_signal):
+    """
+    Mean squared error, maximum absolute error and SNR (dB) of a reconstruction against the reference signal.
+    The SNR is None when it is not finite (an exact reconstruction or a silent reference), so the metrics
+    stay valid JSON.
+    """
+    error = reference - reconstructed_signal
+    mse = float(np.mean(error ** 2))
+    signal_power = float(np.mean(reference ** 2))
+    snr_db = float(10 * np.log10(signal_power / mse)) if mse > 0 and signal_power > 0 else None
+    return {"mse": mse, "max_error": float(np.max(np.abs(error))), "snr_db": snr_db}
+
+
+def reconstruct(method, t_sampled, amplitude_sampled, t_interp):
+    """Reconstructs the signal at t_interp with one of the registered RECONSTRUCTION_METHODS by name."""
+    if method not in RECONSTRUCTION_METHODS:
+        raise ValueError(f"Reconstruction method '{method}' not recognized.")
+    return RECONSTRUCTION_METHODS[method](t_sampled, amplitude_sampled, t_interp)
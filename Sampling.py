@@ -0,0 +1,147 @@
+from fractions import Fraction
+
+import numpy as np
+from scipy.interpolate import make_interp_spline
+from scipy.signal import firwin, upfirdn
+
+# How the sampled points are taken from the dense signal:
+# - "Exact (Polyphase)": band-limited interpolation to the instants k / fs with a rational polyphase filter.
+# - "Exact (Interpolated)": evaluates a cubic spline through the dense signal at the instants k / fs.
+# - "Stride": keeps every k-th point, so the real rate snaps to 1 / (k * dt).
+# - "Jittered": the instants k / fs displaced by random timing errors, with a share of the samples dropped.
+# - "Random": as many instants as the exact modes, spread uniformly at random over the signal.
+SAMPLING_MODES = ("Exact (Polyphase)", "Exact (Interpolated)", "Stride", "Jittered", "Random")
+DEFAULT_SAMPLING_MODE = "Exact (Polyphase)"
+
+# Modes whose sample times are not on a uniform grid.
+NONUNIFORM_MODES = ("Jittered", "Random")
+
+# Timing errors of the "Jittered" mode are uniform within +-JITTER_FRACTION / 2 sampling periods, and
+# DROPOUT_FRACTION of its samples are lost.
+JITTER_FRACTION = 0.5
+DROPOUT_FRACTION = 0.05
+
+# Seed of the non-uniform sample times; the same settings always give the same instants.
+NONUNIFORM_SEED = 0
+
+# Largest denominator of the rational approximation up / down of fs * dt.
+POLYPHASE_MAX_DENOMINATOR = 10000
+
+# Taps of the polyphase filter on each side of an output sample, per phase.
+POLYPHASE_HALF_TAPS = 16
+
+
+def sampling_interval(time, sampling_frequency, time_step=None):
+    """
+    Converts a sampling frequency (Hz) into a stride in samples of the original time axis.
+    Pass the cached time_step of the signal to avoid recomputing it from the time array.
+    """
+    if time_step is None:
+        time_step = np.mean(np.diff(time))  # Time step of original data
+    return max(1, int(1 / (sampling_frequency * time_step)))
+
+
+def rational_rate(sampling_frequency, time_step, max_denominator=POLYPHASE_MAX_DENOMINATOR):
+    """Approximates the rate ratio fs * dt as up / down with down <= max_denominator."""
+    ratio = Fraction(float(sampling_frequency) * float(time_step)).limit_denominator(max_denominator)
+    if ratio == 0:
+        ratio = Fraction(1, max_denominator)
+    return ratio.numerator, ratio.denominator
+
+
+def polyphase_sample(time, amplitude, sampling_frequency, time_step=None, half_taps=POLYPHASE_HALF_TAPS):
+    """
+    Samples the signal at the instants time[0] + k * down / (up * dt) with up / down ~ fs * dt, using a
+    polyphase filter that only removes the images of the up-sampling. There is no anti-aliasing filter, so
+    sampling below the Nyquist rate still aliases exactly like point sampling would.
+    Each output sample costs 2 * half_taps + 1 multiplications, whatever up and down are.
+    The filter sees zeros past both ends of the signal, so the first and last half_taps samples are tapered.
+    """
+    if time_step is None:
+        time_step = np.mean(np.diff(time))
+    up, down = rational_rate(sampling_frequency, time_step)
+
+    if up == 1:
+        half_length, taps = 0, np.ones(1)  # Plain decimation: the output instants are original samples
+    else:
+        # Low-pass at the original Nyquist frequency of the up-sampled stream, gain up to keep the amplitude
+        half_length = half_taps * up
+        taps = firwin(2 * half_length + 1, 1 / up, window=('kaiser', 8.0)) * up
+    # Leading zeros so that the filter delay is a whole number of output samples
+    padding = (-half_length) % down
+    taps = np.concatenate([np.zeros(padding), taps])
+    delay = (half_length + padding) // down
+
+    count = (len(amplitude) - 1) * up // down + 1
+    amplitude_sampled = upfirdn(taps, amplitude, up, down, axis=0)[delay:delay + count]
+    amplitude_sampled = amplitude_sampled.astype(np.result_type(amplitude, np.float32), copy=False)
+    t_sampled = time[0] + np.arange(count) * (down / up) * time_step
+    return t_sampled, amplitude_sampled
+
+
+def _sample_count(time, sampling_frequency):
+    return int(np.floor((time[-1] - time[0]) * sampling_frequency + 1e-9)) + 1
+
+
+def sample_at(time, amplitude, t_sampled):
+    """
+    Samples the signal at arbitrary increasing instants (e.g. timestamps recorded with a capture) by
+    evaluating a cubic spline through the dense signal. Building the spline is one banded solve.
+    """
+    amplitude_sampled = make_interp_spline(time, amplitude, k=3)(t_sampled)
+    return t_sampled, amplitude_sampled.astype(np.result_type(amplitude, np.float32), copy=False)
+
+
+def interpolated_sample(time, amplitude, sampling_frequency, time_step=None):
+    """
+    Samples the signal at exactly time[0] + k / fs by evaluating a cubic spline through the dense signal.
+    Works on non-uniform time axes too.
+    """
+    return sample_at(time, amplitude, time[0] + np.arange(_sample_count(time, sampling_frequency)) / sampling_frequency)
+
+
+def nonuniform_instants(time, sampling_frequency, mode, seed=NONUNIFORM_SEED):
+    """
+    Increasing sample times of a non-uniform mode with an average rate of about sampling_frequency.
+    Jittered instants stay in order since each one moves by less than half a period.
+    """
+    generator = np.random.default_rng([seed, SAMPLING_MODES.index(mode)])
+    count = _sample_count(time, sampling_frequency)
+    if mode == "Jittered":
+        offsets = generator.uniform(-JITTER_FRACTION / 2, JITTER_FRACTION / 2, count)
+        instants = time[0] + (np.arange(count) + offsets) / sampling_frequency
+        instants = instants[generator.random(count) >= DROPOUT_FRACTION]
+    elif mode == "Random":
+        instants = np.sort(generator.uniform(time[0], time[-1], count))
+    else:
+        raise ValueError(f"Sampling mode '{mode}' is not a non-uniform mode.")
+    return np.clip(instants, time[0], time[-1])
+
+
+def sampling_key(time, sampling_frequency, time_step=None, mode="Stride"):
+    """
+    Value that identifies the sampled points for a given signal: the stride for "Stride" sampling, where
+    many frequencies give the same points, and the frequency itself for the other modes (the non-uniform
+    instants are seeded, so they only depend on the frequency too).
+    """
+    if mode == "Stride":
+        return sampling_interval(time, sampling_frequency, time_step)
+    return mode, float(sampling_frequency)
+
+
+def sample_signal(time, amplitude, sampling_frequency, time_step=None, mode="Stride"):
+    """
+    Samples the signal at sampling_frequency with one of the SAMPLING_MODES.
+    amplitude is (N,) or (N, channels); all channels are sampled at the same instants in one pass.
+    """
+    if mode == "Exact (Polyphase)":
+        return polyphase_sample(time, amplitude, sampling_frequency, time_step)
+    if mode == "Exact (Interpolated)":
+        return interpolated_sample(time, amplitude, sampling_frequency, time_step)
+    if mode in NONUNIFORM_MODES:
+        return sample_at(time, amplitude, nonuniform_instants(time, sampling_frequency, mode))
+    if mode != "Stride":
+        raise ValueError(f"Sampling mode '{mode}' not recognized.")
+    # Downsample the signal by taking every k-th point, where k matches the requested sampling frequency
+    interval = sampling_interval(time, sampling_frequency, time_step)
+    return time[::interval], amplitude[::interval]
@@ -0,0 +1,211 @@
+import json
+import os
+import struct
+import sys
+import warnings
+
+import numpy as np
+
+# Native binary signal format (.sig): magic bytes, the header length as little-endian uint64, a JSON header
+# describing every array (dtype, shape, offset) plus free-form metadata, then the raw arrays, each starting
+# on a 64-byte boundary so they can be memory-mapped in place.
+SIGNAL_MAGIC = b"NYQSIG1\n"
+SIGNAL_ALIGNMENT = 64
+
+# Rows formatted per chunk when writing CSV files.
+CSV_WRITE_CHUNK_ROWS = 2 ** 16
+
+
+def _aligned(size):
+    return -(-size // SIGNAL_ALIGNMENT) * SIGNAL_ALIGNMENT
+
+
+def _write_header(file, layout, metadata):
+    """
+    Writes the magic bytes and the JSON header for arrays given as {name: (dtype, shape)}.
+    Returns the offset of the first array, the header entries and the total file size.
+    """
+    entries, offset = {}, 0
+    for name, (dtype, shape) in layout.items():
+        dtype, shape = np.dtype(dtype), tuple(shape)
+        entries[name] = {"dtype": dtype.str, "shape": list(shape), "offset": offset}
+        offset += _aligned(int(np.prod(shape)) * dtype.itemsize)
+
+    header = json.dumps({"arrays": entries, "metadata": metadata or {}}).encode()
+    data_start = _aligned(len(SIGNAL_MAGIC) + 8 + len(header))
+    file.write(SIGNAL_MAGIC)
+    file.write(struct.pack('<Q', len(header)))
+    file.write(header)
+    return data_start, entries, data_start + offset
+
+
+def _map_arrays(file_name, data_start, entries, mode):
+    arrays = {}
+    for name, entry in entries.items():
+        shape = tuple(entry["shape"])
+        if np.prod(shape) == 0:
+            arrays[name] = np.empty(shape, dtype=entry["dtype"])  # np.memmap cannot map empty arrays
+        else:
+            arrays[name] = np.memmap(file_name, dtype=entry["dtype"], mode=mode, offset=data_start + entry["offset"],
+                                     shape=shape)
+    return arrays
+
+
+def write_binary_signal(file_name, arrays, metadata=None):
+    """Writes named arrays and a metadata dict to a native .sig file."""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    with open(file_name, 'wb') as file:
+        data_start, entries, size = _write_header(file, {name: (array.dtype, array.shape)
+                                                         for name, array in arrays.items()}, metadata)
+        for name, array in arrays.items():
+            file.seek(data_start + entries[name]["offset"])
+            array.tofile(file)
+        file.truncate(size)
+
+
+def create_binary_signal(file_name, layout, metadata=None):
+    """
+    Creates a native .sig file with zero-filled arrays given as {name: (dtype, shape)} and returns them as
+    writable memory maps, so signals larger than memory can be written chunk by chunk.
+    """
+    with open(file_name, 'wb') as file:
+        data_start, entries, size = _write_header(file, layout, metadata)
+        file.truncate(size)
+    return _map_arrays(file_name, data_start, entries, 'r+')
+
+
+def read_binary_signal(file_name):
+    """
+    Opens a native .sig file and returns (arrays, metadata).
+    Arrays are read-only memory maps, so nothing is read from disk until it is used.
+    """
+    with open(file_name, 'rb') as file:
+        if file.read(len(SIGNAL_MAGIC)) != SIGNAL_MAGIC:
+            raise ValueError("File is not a signal file (.sig).")
+        header_length, = struct.unpack('<Q', file.read(8))
+        header = json.loads(file.read(header_length))
+    data_start = _aligned(len(SIGNAL_MAGIC) + 8 + header_length)
+    return _map_arrays(file_name, data_start, header["arrays"], 'r'), header["metadata"]
+
+
+def _read_csv_columns(file_name):
+    """
+    Parses a 'Time,<channel>,...' CSV file into a time array and an (N, channels) amplitude array (views of
+    one parsed array). numpy's parser reads the file in bounded blocks, so the text is never held in memory
+    as a whole; the peak memory of a load is about the size of the parsed values.
+    Returns (time, amplitude, channel names from the header row).
+    """
+    with open(file_name, 'r') as file:
+        names = [name.strip() for name in file.readline().split(',')][1:]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # An empty file is reported below
+        data = np.loadtxt(file_name, delimiter=',', skiprows=1, ndmin=2)
+    if len(data) == 0 or data.shape[1] < 2 or data.shape[1] != len(names) + 1:
+        raise ValueError("File must contain a Time column and one column per channel.")
+    return data[:, 0], data[:, 1:], names
+
+
+def _channel_names(count):
+    return ["Signal"] if count == 1 else [f"Channel {index + 1}" for index in range(count)]
+
+
+def load_signal_channels(file_name):
+    """
+    Loads a signal with one or more channels sharing its time axis.
+    Returns the time array, an (N, channels) amplitude array and the channel names.
+    Supports 'Time,<channel>,...' CSV files (one header row), native .sig files holding a 'time' array and an
+    (N,) or (N, channels) 'signal' array (names in the 'channels' metadata), and .npy files holding an
+    (N, 1 + channels) array; the binary formats are memory-mapped.
+    Raises IOError if the file cannot be opened and ValueError if it is not formatted correctly.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension == '.sig':
+        arrays, metadata = read_binary_signal(file_name)
+        if 'time' not in arrays or 'signal' not in arrays:
+            raise ValueError("Signal file must contain 'time' and 'signal' arrays.")
+        time, amplitude = arrays['time'], arrays['signal']
+        if time.ndim != 1 or amplitude.ndim not in (1, 2) or len(time) != len(amplitude):
+            raise ValueError("Signal file 'time' and 'signal' arrays must have the same length.")
+        amplitude = amplitude.reshape(len(amplitude), -1)
+        names = metadata.get("channels", _channel_names(amplitude.shape[1]))
+        return time, amplitude, names
+
+    if extension == '.npy':
+        data = np.load(file_name, mmap_mode='r')
+        if data.ndim != 2 or data.shape[1] < 2:
+            raise ValueError("File must contain a Time column and one column per channel.")
+        return data[:, 0], data[:, 1:], _channel_names(data.shape[1] - 1)
+
+    return _read_csv_columns(file_name)
+
+
+def load_signal_file(file_name):
+    """
+    Loads a single-channel signal and returns the time and amplitude arrays, from any file that
+    load_signal_channels reads. Raises ValueError if the file holds more than one channel.
+    """
+    time, amplitude, _ = load_signal_channels(file_name)
+    if amplitude.shape[1] != 1:
+        raise ValueError("File must contain exactly two columns: Time and Signal.")
+    return time, amplitude[:, 0]
+
+
+def write_csv_rows(file, columns, chunk_rows=CSV_WRITE_CHUNK_ROWS):
+    """
+    Appends the rows of equal-length columns to an open text file, formatting one chunk at a time.
+    Values are written with the shortest text that reads back to the same float.
+    """
+    for start in range(0, len(columns[0]), chunk_rows):
+        rows = np.column_stack([column[start:start + chunk_rows] for column in columns]).tolist()
+        file.write("".join(",".join(map(repr, row)) + "\n" for row in rows))
+
+
+def write_csv_signal(file_name, columns):
+    """Writes {header name: array} columns to a CSV file with one header row, in chunks."""
+    with open(file_name, 'w', newline='') as file:
+        file.write(",".join(columns) + "\n")
+        write_csv_rows(file, [np.asarray(column, dtype=float) for column in columns.values()])
+
+
+def save_signal_file(file_name, time, amplitude, names=None):
+    """
+    Saves a signal as a native .sig file, an (N, 1 + channels) .npy file or a 'Time,<channel>,...' CSV file,
+    by file extension. amplitude is (N,) for one channel or (N, channels), with optional channel names.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    channels = np.reshape(amplitude, (len(amplitude), -1))
+    names = list(names) if names is not None else _channel_names(channels.shape[1])
+    if extension == '.sig':
+        write_binary_signal(file_name, {"time": time, "signal": amplitude},
+                            {"channels": names} if channels.shape[1] > 1 else None)
+    elif extension == '.npy':
+        np.save(file_name, np.column_stack([time, channels]))
+    elif extension == '.csv':
+        write_csv_signal(file_name, {"Time": time, **{name: channels[:, index] for index, name in enumerate(names)}})
+    else:
+        raise ValueError(f"Unsupported signal file extension '{extension}'.")
+
+
+def export_signals(file_name, columns, samples, metadata=None):
+    """
+    Exports full-length columns {name: array}, starting with 'time' and 'signal', the sampled points
+    {name: array} and the parameters. A .sig file holds all of them and loads back like any signal file,
+    with the other arrays memory-mapped; a .csv file holds the columns, with the sampled points in
+    '<name>_samples.csv' beside it and the parameters left out.
+    """
+    base, extension = os.path.splitext(file_name)
+    if extension.lower() == '.sig':
+        write_binary_signal(file_name, {**columns, **samples}, metadata)
+    elif extension.lower() == '.csv':
+        write_csv_signal(file_name, {name.title(): array for name, array in columns.items()})
+        write_csv_signal(f"{base}_samples.csv", {name.title(): array for name, array in samples.items()})
+    else:
+        raise ValueError(f"Unsupported export file extension '{extension}'.")
+
+
+if __name__ == "__main__":
+    # Convert a signal file to another format, e.g. python SignalIO.py capture.csv capture.sig
+    if len(sys.argv) != 3:
+        print("Usage: python SignalIO.py <input file> <output .sig/.npy/.csv file>")
+        sys.exit(1)
+    save_signal_file(sys.argv[2], *load_signal_channels(sys.argv[1]))
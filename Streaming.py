@@ -0,0 +1,247 @@
+import io
+import os
+import socket
+
+import numpy as np
+
+import Reconstruction
+import Sampling
+
+# Number of most recent samples kept for display and reconstruction while streaming.
+STREAM_CAPACITY = 2 ** 16
+
+# Taps of the windowed sinc kernel used for streaming; the exact sinc needs every sample and cannot stream.
+STREAM_SINC_WIDTH = 32
+
+
+class RingBuffer:
+    """
+    Fixed-capacity FIFO of rows of floats. Appending never reallocates; the oldest rows are overwritten.
+    Rows are addressed by their global index, i.e. the number of rows appended before them.
+    """
+
+    def __init__(self, capacity=STREAM_CAPACITY, columns=1):
+        self.capacity = capacity
+        self.data = np.zeros((capacity, columns))
+        self.start = 0  # Global index of the first row appended since the last reset
+        self.count = 0  # Global index of the next row to append
+
+    @property
+    def oldest_index(self):
+        return max(self.start, self.count - self.capacity)
+
+    def reset(self, start_index=0):
+        """Empties the buffer; the next appended row gets the global index start_index."""
+        self.start = self.count = start_index
+
+    def append(self, rows):
+        rows = np.asarray(rows, dtype=self.data.dtype).reshape(-1, self.data.shape[1])
+        skipped = max(0, len(rows) - self.capacity)  # Rows that would be overwritten immediately
+        rows = rows[skipped:]
+        self.count += skipped
+
+        position = self.count % self.capacity
+        first = min(len(rows), self.capacity - position)
+        self.data[position:position + first] = rows[:first]
+        self.data[:len(rows) - first] = rows[first:]
+        self.count += len(rows)
+
+    def get(self, start, stop):
+        """Returns the rows with global indices [start, stop) in order, clipped to what is still stored."""
+        start, stop = max(start, self.oldest_index), min(stop, self.count)
+        if stop <= start:
+            return self.data[:0]
+        return np.take(self.data, np.arange(start, stop) % self.capacity, axis=0)
+
+
+class _LineSource:
+    """Turns a stream of 'time,signal' text lines into sample arrays, buffering incomplete lines."""
+
+    def __init__(self):
+        self.pending = b""
+        self.header_checked = False
+
+    def _parse(self, data):
+        self.pending += data
+        complete, _, self.pending = self.pending.rpartition(b"\n")
+        if not self.header_checked and complete:
+            first_line = complete.split(b"\n", 1)[0].strip()
+            if first_line[:1] not in b"0123456789+-.":
+                complete = complete[len(first_line) + 1:]  # Skip the 'Time,Signal' header row
+            self.header_checked = True
+        if not complete.strip():
+            return np.empty(0), np.empty(0)
+
+        rows = np.loadtxt(io.BytesIO(complete), delimiter=',', ndmin=2)
+        if rows.shape[1] != 2:
+            raise ValueError("Stream must contain exactly two columns: Time and Signal.")
+        return rows[:, 0], rows[:, 1]
+
+    def close(self):
+        pass
+
+
+class FileTailSource(_LineSource):
+    """Follows a growing 'Time,Signal' CSV file and returns the rows appended since the last read."""
+
+    def __init__(self, file_name):
+        super().__init__()
+        if not os.path.isfile(file_name):
+            raise IOError(f"Cannot open '{file_name}' for streaming.")
+        self.file_name = file_name
+        self.position = 0
+
+    def read(self):
+        with open(self.file_name, 'rb') as file:
+            file.seek(self.position)
+            data = file.read()
+        self.position += len(data)
+        return self._parse(data)
+
+
+class SocketSource(_LineSource):
+    """Listens on a local TCP port and returns the 'time,signal' lines a client has sent since the last read."""
+
+    def __init__(self, port, host="127.0.0.1"):
+        super().__init__()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(1)
+        self.server.setblocking(False)
+        self.client = None
+
+    def read(self):
+        if self.client is None:
+            try:
+                self.client, _ = self.server.accept()
+                self.client.setblocking(False)
+            except BlockingIOError:
+                return np.empty(0), np.empty(0)
+
+        chunks = []
+        while True:
+            try:
+                chunk = self.client.recv(65536)
+            except BlockingIOError:
+                break
+            if not chunk:  # Client disconnected; wait for the next one
+                self.client.close()
+                self.client = None
+                break
+            chunks.append(chunk)
+        return self._parse(b"".join(chunks))
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+        self.server.close()
+
+
+def open_source(spec):
+    """Opens a stream source: 'tcp:<port>' listens on a local port, anything else is a file to tail."""
+    if spec.startswith("tcp:"):
+        return SocketSource(int(spec[4:]))
+    return FileTailSource(spec)
+
+
+def _stream_kernel(method):
+    """
+    Finite-support reconstruction used for streaming, with the number of sample periods it needs
+    before and after each output time.
+    """
+    if method in ("Sinc Interpolation", "Spectral (FFT) Sinc"):
+        half_width = STREAM_SINC_WIDTH // 2
+        return (lambda t_sampled, amplitude_sampled, t_interp: Reconstruction.sinc_interpolation(
+            t_sampled, amplitude_sampled, t_interp, kernel_width=STREAM_SINC_WIDTH, window="hann"),
+                half_width, half_width)
+    if method == "Lanczos Resampling":
+        return Reconstruction.lanczos_resampling, 3, 3
+    if method == "Non-uniform Sinc (Iterative)":
+        # Streamed samples are uniform, where the fit is exact and this is a Hann-windowed sinc
+        half_width = Reconstruction.NONUNIFORM_HALF_WIDTH
+        return Reconstruction.nonuniform_sinc_interpolation, half_width, half_width
+    if method == "First-Order Hold":
+        return Reconstruction.first_order_hold_interpolation, 1, 1
+    if method == "Zero-Order Hold":
+        return Reconstruction.zero_order_hold_interpolation, 1, 0
+    raise ValueError(f"Reconstruction method '{method}' is not supported for streaming.")
+
+
+class StreamingReconstructor:
+    """
+    Reconstructs a live signal block by block with overlap-save: each update only finalizes the
+    output times whose kernel support is complete, using the new samples plus a fixed overlap of
+    earlier ones, so the cost per block does not grow with the stream length.
+    Output lags the input by the kernel's look-ahead (a few sampling periods).
+    """
+
+    def __init__(self, capacity=STREAM_CAPACITY):
+        self.input = RingBuffer(capacity, columns=2)  # (time, amplitude)
+        self.output = RingBuffer(capacity, columns=1)  # Reconstructed amplitude, same global indices as input
+        self.finalized = 0  # Global index of the first output not computed yet
+        self.parameters = None
+        self.time_step = None
+
+    def push(self, time, amplitude):
+        if len(time):
+            self.input.append(np.column_stack([time, amplitude]))
+        if self.time_step is None and self.input.count > 1:
+            first = self.input.get(0, min(self.input.count, 1024))
+            self.time_step = float(np.mean(np.diff(first[:, 0])))
+
+    def process(self, method, sampling_frequency):
+        """Finalizes every output whose kernel support is available and returns how many were added."""
+        if self.time_step is None:
+            return 0
+        stride = Sampling.sampling_interval(None, sampling_frequency, self.time_step)
+        reconstruct, before, after = _stream_kernel(method)
+
+        if self.parameters != (method, stride):
+            # New parameters: recompute only what is still visible instead of the whole history
+            self.parameters = (method, stride)
+            self.finalized = self.input.oldest_index
+            self.output.reset(self.finalized)
+        elif self.finalized < self.input.oldest_index:
+            # A burst larger than the buffer overwrote samples that were never reconstructed: skip past them
+            self.finalized = self.input.oldest_index
+            self.output.reset(self.finalized)
+
+        stop = self.input.count - after * stride
+        if stop <= self.finalized:
+            return 0
+        start = self.finalized
+
+        # Overlap: the samples of the previous `before` periods and the next `after` periods
+        window_start = max(self.input.oldest_index, start - (before + 1) * stride)
+        window = self.input.get(window_start, self.input.count)
+        sample_offset = (-window_start) % stride  # Keep the sampling phase global across blocks
+        sampled = window[sample_offset::stride]
+
+        targets = window[start - window_start:stop - window_start, 0]
+        if len(sampled) < 2:
+            block = np.zeros(len(targets))
+        else:
+            block = reconstruct(sampled[:, 0], sampled[:, 1], targets)
+        self.output.append(block)
+        self.finalized = stop
+        return len(block)
+
+    def view(self):
+        """Time, input amplitude and reconstructed amplitude over the stored window, plus the sampled points."""
+        start, stop = max(self.input.oldest_index, self.output.oldest_index), self.finalized
+        samples = self.input.get(self.input.oldest_index, self.input.count)
+        reconstructed = self.output.get(start, stop)[:, 0]
+        window = samples[start - self.input.oldest_index:stop - self.input.oldest_index]
+
+        stride = self.parameters[1] if self.parameters else 1
+        sample_offset = (-self.input.oldest_index) % stride
+        return {
+            "time": samples[:, 0],
+            "amplitude": samples[:, 1],
+            "t_sampled": samples[sample_offset::stride, 0],
+            "amplitude_sampled": samples[sample_offset::stride, 1],
+            "t_reconstructed": window[:, 0],
+            "reconstructed_signal": reconstructed,
+            "difference": window[:, 1] - reconstructed,
+        }
@@ -0,0 +1,254 @@
+import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+import Cache
+import Noise
+import Precision
+import Profiling
+import Reconstruction
+import Sampling
+
+
+def sample_and_reconstruct(time, amplitude, time_step, method, sampling_frequency, cache=None, signal_id=None,
+                           sampling_mode=Sampling.DEFAULT_SAMPLING_MODE, sampled=None):
+    """
+    Samples the clean signal at sampling_frequency with sampling_mode and reconstructs it. A (N, channels)
+    amplitude is sampled and reconstructed for every channel at once.
+    The result only depends on the signal, the method and the sampled points, so it is memoized in cache
+    under (signal_id, method, Sampling.sampling_key(...)). Pass the (t_sampled, amplitude_sampled) of the
+    same settings as `sampled` to skip the sampling.
+    """
+    key = (signal_id, method, Sampling.sampling_key(time, sampling_frequency, time_step, sampling_mode))
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if sampled is not None:
+        t_sampled, amplitude_sampled = sampled
+    else:
+        with Profiling.PROFILER.stage("decimation"):
+            t_sampled, amplitude_sampled = Sampling.sample_signal(time, amplitude, sampling_frequency, time_step,
+                                                                  sampling_mode)
+    t_interp = time  # High-resolution time array for reconstruction
+    if method in Reconstruction.RECONSTRUCTION_METHODS:
+        with Profiling.PROFILER.stage("reconstruction"):
+            reconstructed_signal = Reconstruction.reconstruct(method, t_sampled, amplitude_sampled, t_interp)
+    else:
+        print(f"Reconstruction method '{method}' not recognized.")
+        reconstructed_signal = np.zeros(np.shape(amplitude))  # Fallback if no method matches
+
+    value = {
+        "t_sampled": t_sampled,
+        "amplitude_sampled": amplitude_sampled,
+        "reconstructed_signal": reconstructed_signal,
+    }
+    if cache is not None:
+        cache.put(key, value)
+    return value
+
+
+def run_reconstruction(time, amplitude, time_step, method, sampling_frequency, signal_id=None, cache=None,
+                       is_stale=None, sampling_mode=Sampling.DEFAULT_SAMPLING_MODE, **_):
+    """
+    Samples and reconstructs the clean signal: the background stages of the processing pipeline.
+    Touches no widgets, so it can run on a worker thread. Returns None if is_stale() reports that a
+    newer request superseded this one before all stages finished.
+    """
+    # Step 1-3: Downsample the signal and reconstruct it with the selected method (memoized)
+    sampled = sample_and_reconstruct(time, amplitude, time_step, method, sampling_frequency, cache, signal_id,
+                                     sampling_mode)
+    if is_stale is not None and is_stale():
+        return None
+    return dict(sampled, method=method, sampling_frequency=sampling_frequency, sampling_mode=sampling_mode)
+
+
+def reconstruction_noise(reconstructed_signal, noise_power, signal_power, sampling_frequency, max_slide_frequency):
+    """
+    Adds noise matching the SNR of the displayed signal to the reconstruction, scaled down as the sampling
+    frequency approaches the top of the slider. noise_power is the power of the noise on the displayed signal.
+    """
+    # Step 4: Calculate the Original SNR from the power of the noise in the original noisy signal
+    original_snr_linear = signal_power / noise_power  # Original SNR in linear scale
+    original_noise_power = signal_power / original_snr_linear
+
+    noise_scale = 1 - (sampling_frequency / max_slide_frequency)
+    print(f"Noise Scale is {noise_scale * 100}%")
+
+    # Step 5: Add noise to the reconstructed signal based on original SNR
+    with Profiling.PROFILER.stage("reconstruction noise"):
+        # The scaled noise array becomes the output, so no second full-length array is needed
+        reconstructed_signal_noisy, _ = Noise.NOISE.scaled("reconstruction", len(reconstructed_signal),
+                                                           np.sqrt(original_noise_power * noise_scale),
+                                                           reconstructed_signal.dtype)
+        reconstructed_signal_noisy += reconstructed_signal
+    return reconstructed_signal_noisy
+
+
+def compare_methods(time, amplitude, time_step, sampling_frequency, sampling_mode=Sampling.DEFAULT_SAMPLING_MODE,
+                    methods=None):
+    """
+    Samples the clean signal once and reconstructs it with every registered method (or `methods`) in one
+    shared pass. Returns one row per method with its error metrics against the clean signal and its
+    compute time, and the time of the work the methods shared.
+    float32 (compact) amplitudes also get the float64 MSE and the largest float32/float64 difference per method.
+    """
+    t_sampled, amplitude_sampled = Sampling.sample_signal(time, amplitude, sampling_frequency, time_step,
+                                                          sampling_mode)
+    signals, seconds = Reconstruction.reconstruct_all(t_sampled, amplitude_sampled, time, methods)
+    rows = [dict(method=method, seconds=seconds[method],
+                 **Reconstruction.reconstruction_metrics(amplitude, reconstructed_signal))
+            for method, reconstructed_signal in signals.items()]
+
+    if amplitude.dtype == Precision.COMPACT_DTYPE:
+        # Precision impact: the same samples reconstructed in float64
+        impact = Precision.precision_impact(signals, t_sampled, amplitude_sampled, time, amplitude)
+        for row in rows:
+            row.update(impact[row["method"]])
+    return rows, seconds["Shared"]
+
+
+def neighbouring_sampling_frequencies(time, time_step, sampling_frequency, max_slide_frequency, count=2,
+                                     sampling_mode=Sampling.DEFAULT_SAMPLING_MODE):
+    """
+    Slider positions worth prefetching around sampling_frequency: the nearest `count` positions on
+    each side that give different sampled points, nearest first.
+    """
+    current_key = Sampling.sampling_key(time, sampling_frequency, time_step, sampling_mode)
+    sides = []
+    for direction, limit in ((1, max_slide_frequency + 1), (-1, 0)):
+        side, seen = [], {current_key}
+        for frequency in range(int(sampling_frequency) + direction, limit, direction):
+            key = Sampling.sampling_key(time, frequency, time_step, sampling_mode)
+            if key not in seen:
+                seen.add(key)
+                side.append(frequency)
+                if len(side) == count:
+                    break
+        sides.append(side)
+
+    above, below = sides
+    neighbours = []
+    for index in range(count):
+        neighbours.extend(side[index] for side in (above, below) if index < len(side))
+    return neighbours
+
+
+def prefetch_reconstructions(time, amplitude, time_step, method, sampling_frequency, max_slide_frequency,
+                             signal_id=None, cache=None, is_stale=None, sampling_mode=Sampling.DEFAULT_SAMPLING_MODE,
+                             **_):
+    """Fills the cache with reconstructions for the slider positions around sampling_frequency."""
+    for frequency in neighbouring_sampling_frequencies(time, time_step, sampling_frequency, max_slide_frequency,
+                                                       sampling_mode=sampling_mode):
+        if is_stale is not None and is_stale():
+            return
+        sample_and_reconstruct(time, amplitude, time_step, method, frequency, cache, signal_id, sampling_mode)
+
+
+class _JobSignals(QObject):
+    finished = pyqtSignal(int, object)
+
+
+class _ReconstructionRunnable(QRunnable):
+    def __init__(self, generation, work, job, is_stale):
+        super().__init__()
+        self.generation = generation
+        self.work = work
+        self.job = job
+        self.is_stale = is_stale
+        self.signals = _JobSignals()
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.work(**self.job, is_stale=lambda: self.is_stale(self.generation))
+        except Exception as error:
+            print(f"Background reconstruction failed: {error}")
+            result = None
+        self.signals.finished.emit(self.generation, result)
+
+
+class ReconstructionScheduler(QObject):
+    """
+    Runs reconstruction jobs on a background thread, coalescing bursts of requests.
+    Requests are debounced, at most one job runs at a time, only the latest requested parameters are
+    computed next, and results of superseded jobs are dropped instead of being emitted.
+    Once the user has been idle for prefetch_delay_ms, the reconstructions of the neighbouring slider
+    positions are computed into the shared cache so that scrubbing back and forth hits it.
+    """
+    result_ready = pyqtSignal(object)
+
+    def __init__(self, parent=None, debounce_ms=15, prefetch_delay_ms=250, cache=None):
+        super().__init__(parent)
+        self.debounce_ms = debounce_ms
+        self.prefetch_delay_ms = prefetch_delay_ms
+        self.cache = cache if cache is not None else Cache.ReconstructionCache()
+        self.last_job = None
+        self.generation = 0  # Id of the latest request; older jobs are stale
+        self.pending_job = None
+        self.running = False
+        self.active_runnable = None  # Keeps the Python wrapper alive while the pool runs it
+
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self._start_latest)
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self._start_prefetch)
+
+    def request(self, job):
+        """Queues a job (keyword arguments of run_reconstruction), superseding any older request."""
+        self.generation += 1
+        self.pending_job = (self.generation, job)
+        self.idle_timer.stop()
+        self.debounce_timer.start(self.debounce_ms)
+
+    def cancel(self):
+        """Drops the queued job and marks the running one as stale."""
+        self.generation += 1
+        self.pending_job = None
+        self.last_job = None
+        self.debounce_timer.stop()
+        self.idle_timer.stop()
+
+    def is_stale(self, generation):
+        return generation != self.generation
+
+    def is_busy(self):
+        return self.running or self.pending_job is not None
+
+    def _start_latest(self):
+        if self.running or self.pending_job is None:
+            return
+        generation, job = self.pending_job
+        self.pending_job = None
+        self.last_job = job
+        self._start(generation, run_reconstruction, job)
+
+    def _start_prefetch(self):
+        if self.running or self.pending_job is not None or self.last_job is None:
+            return
+        self._start(self.generation, prefetch_reconstructions, self.last_job)
+
+    def _start(self, generation, work, job):
+        self.running = True
+        runnable = _ReconstructionRunnable(generation, work, dict(job, cache=self.cache), self.is_stale)
+        runnable.signals.finished.connect(self._on_finished)
+        self.active_runnable = runnable
+        self.thread_pool.start(runnable)
+
+    def _on_finished(self, generation, result):
+        self.running = False
+        self.active_runnable = None
+        if result is not None and not self.is_stale(generation):
+            self.result_ready.emit(result)
+        if self.debounce_timer.isActive():
+            return
+        if self.pending_job is not None:
+            self._start_latest()
+        elif result is not None:
+            self.idle_timer.start(self.prefetch_delay_ms)  # Prefetch once, after the latest result arrived
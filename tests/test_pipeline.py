@@ -0,0 +1,74 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+import Main
+import SignalIO
+from Main import MainWindow, RENDER_STAGES
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def window(app, monkeypatch):
+    window = MainWindow()
+    errors = []
+    monkeypatch.setattr(window, "show_error_message", errors.append)
+    window.errors = errors
+    yield window
+    window.reconstruction_scheduler.cancel()
+    window.close()
+
+
+def sine(frequency, duration=1.0, time_step=1e-3):
+    time = np.arange(0, duration, time_step)
+    return time, np.sin(2 * np.pi * frequency * time)
+
+
+def test_load_runs_each_stage_once(window):
+    before = window.pipeline.runs.copy()  # The window starts with a default signal loaded
+    window.process_signal_data(*sine(5))
+    runs = window.pipeline.runs - before
+
+    assert not window.errors
+    assert runs["samples"] == 1
+    assert runs["reconstruction"] == 1
+    for stage in RENDER_STAGES:
+        assert runs[stage] == 1
+
+
+def test_rejected_load_keeps_previous_signal(window):
+    window.process_signal_data(*sine(5))
+    signal = window.signal
+    runs = window.pipeline.runs.copy()
+
+    time, amplitude = sine(5, duration=0.5)
+    window.process_signal_data(time, np.zeros_like(amplitude))
+
+    assert window.errors
+    assert window.signal is signal
+    assert len(window.time) == len(signal.time)
+    assert window.pipeline.runs == runs
+    # The controls still drive the previous signal
+    window.update_sampling_frequency(window.ui.sampling_frequency.maximum())
+    window.sample_and_reconstruct_signal()
+    assert len(window.reconstructed_signal_noisy) == len(signal.time)
+
+
+def test_export_matches_pending_controls(window, monkeypatch, tmp_path):
+    window.process_signal_data(*sine(5))
+    window.ui.sampling_frequency.setValue(7)  # Queues a background reconstruction that has not run yet
+    file_name = str(tmp_path / "export.sig")
+    monkeypatch.setattr(Main.QFileDialog, "getSaveFileName", lambda *args, **kwargs: (file_name, ""))
+    window.export_signals()
+
+    arrays, metadata = SignalIO.read_binary_signal(file_name)
+    assert metadata["sampling_frequency"] == 7
+    assert len(arrays["t_sampled"]) == 7
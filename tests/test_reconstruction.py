@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+import Reconstruction
+import Sampling
+
+TIME_STEP = 1e-3
+
+
+def sample_times(kind, count=120, duration=1.0):
+    """Uniform, jittered or random sample times over [0, duration]."""
+    generator = np.random.default_rng(1)
+    period = duration / count
+    if kind == "uniform":
+        return np.arange(count) * period
+    if kind == "jittered":
+        return np.arange(count) * period + generator.uniform(-0.25, 0.25, count) * period
+    return np.sort(generator.uniform(0, duration, count))
+
+
+def samples(kind):
+    t_sampled = sample_times(kind)
+    amplitude_sampled = np.sin(2 * np.pi * 5 * t_sampled) + 0.5 * np.cos(2 * np.pi * 23 * t_sampled)
+    # Output times run past both ends and include every sample instant
+    t_interp = np.union1d(np.linspace(-0.05, 1.05, 701), t_sampled)
+    return t_sampled, amplitude_sampled, t_interp
+
+
+# Sample-by-sample references, written like the original loops
+def reference_sinc(t_sampled, amplitude_sampled, t_interp):
+    T = Reconstruction.sample_period(t_sampled)
+    reconstructed_signal = np.zeros_like(t_interp)
+    for i in range(len(t_sampled)):
+        reconstructed_signal += amplitude_sampled[i] * np.sinc((t_interp - t_sampled[i]) / T)
+    return reconstructed_signal
+
+
+def reference_lanczos(t_sampled, amplitude_sampled, t_interp, a=3):
+    T = Reconstruction.sample_period(t_sampled)
+    reconstructed_signal = np.zeros_like(t_interp)
+    for i in range(len(t_interp)):
+        for j in range(len(t_sampled)):
+            distance = (t_interp[i] - t_sampled[j]) / T
+            if abs(distance) < 1e-10:
+                reconstructed_signal[i] += amplitude_sampled[j]
+            elif abs(distance) < a:
+                reconstructed_signal[i] += amplitude_sampled[j] * np.sinc(distance) * np.sinc(distance / a)
+    return reconstructed_signal
+
+
+def reference_zero_order_hold(t_sampled, amplitude_sampled, t_interp):
+    reconstructed_signal = np.zeros_like(t_interp)
+    for i in range(len(t_sampled) - 1):
+        mask = (t_interp >= t_sampled[i]) & (t_interp < t_sampled[i + 1])
+        reconstructed_signal[mask] = amplitude_sampled[i]
+    reconstructed_signal[t_interp >= t_sampled[-1]] = amplitude_sampled[-1]
+    return reconstructed_signal
+
+
+def reference_first_order_hold(t_sampled, amplitude_sampled, t_interp):
+    reconstructed_signal = np.zeros_like(t_interp)
+    for i in range(len(t_sampled) - 1):
+        mask = (t_interp >= t_sampled[i]) & (t_interp < t_sampled[i + 1])
+        fraction = (t_interp[mask] - t_sampled[i]) / (t_sampled[i + 1] - t_sampled[i])
+        reconstructed_signal[mask] = amplitude_sampled[i] + fraction * (amplitude_sampled[i + 1] - amplitude_sampled[i])
+    reconstructed_signal[t_interp >= t_sampled[-1]] = amplitude_sampled[-1]
+    return reconstructed_signal
+
+
+@pytest.mark.parametrize("kind", ["uniform", "jittered", "random"])
+@pytest.mark.parametrize("method, reference", [
+    (Reconstruction.sinc_interpolation, reference_sinc),
+    (Reconstruction.lanczos_resampling, reference_lanczos),
+    (Reconstruction.zero_order_hold_interpolation, reference_zero_order_hold),
+    (Reconstruction.first_order_hold_interpolation, reference_first_order_hold),
+])
+def test_matches_sample_by_sample_reference(kind, method, reference):
+    t_sampled, amplitude_sampled, t_interp = samples(kind)
+    expected = reference(t_sampled, amplitude_sampled, t_interp)
+    # Relative to the largest value, as stated for the blocked sinc engine
+    np.testing.assert_allclose(method(t_sampled, amplitude_sampled, t_interp), expected, rtol=0,
+                               atol=1e-9 * np.max(np.abs(expected)))
+
+
+def two_channels(count=1000):
+    time = np.arange(count) * TIME_STEP
+    amplitude = np.column_stack([np.sin(2 * np.pi * 5 * time) + 0.5 * np.sin(2 * np.pi * 20 * time),
+                                 np.cos(2 * np.pi * 7 * time)])
+    return time, amplitude
+
+
+@pytest.mark.parametrize("mode, sampling_frequency", [("Stride", 100), ("Exact (Polyphase)", 101),
+                                                      ("Jittered", 90), ("Stride", 1)])
+def test_reconstruct_all_batches_channels(mode, sampling_frequency):
+    time, amplitude = two_channels()
+    t_sampled, amplitude_sampled = Sampling.sample_signal(time, amplitude, sampling_frequency, TIME_STEP, mode)
+
+    signals, _ = Reconstruction.reconstruct_all(t_sampled, amplitude_sampled, time)
+    for method, reconstructed_signal in signals.items():
+        assert reconstructed_signal.shape == amplitude.shape
+        for channel in range(amplitude.shape[1]):
+            expected = Reconstruction.reconstruct(method, t_sampled,
+                                                  np.ascontiguousarray(amplitude_sampled[:, channel]), time)
+            np.testing.assert_allclose(reconstructed_signal[:, channel], expected, rtol=0, atol=1e-9,
+                                       err_msg=method)
+
+
+@pytest.mark.parametrize("count, factor, step, channels", [(97, 1000, 97, None), (64, 13, 5, 3), (50, 7, 3, None)])
+def test_spectral_blocks_match_upsampled_grid(count, factor, step, channels):
+    t_sampled = np.arange(count) * 0.5
+    t_interp = t_sampled[0] - 40 * 0.5 * step / factor + np.arange(count * factor // 2) * 0.5 * step / factor
+    amplitude_sampled = np.random.default_rng(2).standard_normal((count, channels) if channels else count)
+    assert Reconstruction.spectral_resampling_ratio(t_sampled, t_interp) == (factor, step)
+
+    expected = Reconstruction.spectral_sinc_interpolation(t_sampled, amplitude_sampled, t_interp,
+                                                          max_block_elements=10 ** 9)
+    blocked = Reconstruction.spectral_sinc_interpolation(t_sampled, amplitude_sampled, t_interp,
+                                                         max_block_elements=16)
+    np.testing.assert_allclose(blocked, expected, rtol=0, atol=1e-12 * np.max(np.abs(expected)))
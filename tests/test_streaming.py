@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from Streaming import StreamingReconstructor
+
+TIME_STEP = 1e-3
+
+
+def sine(start, count):
+    time = (start + np.arange(count)) * TIME_STEP
+    return time, np.sin(2 * np.pi * 5 * time)
+
+
+@pytest.mark.parametrize("method", ["Lanczos Resampling", "First-Order Hold", "Sinc Interpolation"])
+def test_burst_larger_than_capacity_keeps_output_aligned(method):
+    stream = StreamingReconstructor(1000)
+    stream.push(*sine(0, 500))
+    stream.process(method, 100)
+    stream.push(*sine(500, 3500))  # More rows than the buffer holds, within one poll
+    assert stream.process(method, 100) > 0
+
+    view = stream.view()
+    assert len(view["t_reconstructed"]) == len(view["reconstructed_signal"]) == len(view["difference"])
+    assert len(view["reconstructed_signal"]) > 0
+    # Output times follow the input: the reconstruction still tracks the signal it was computed from
+    assert np.max(np.abs(view["difference"])) < 0.05
+    assert np.all(np.diff(view["t_reconstructed"]) > 0)